@@ -0,0 +1,55 @@
+"""Load-test LLMGateway against stub_llm_server.py.
+
+Fires ``--requests`` concurrent calls spread over ``--distinct`` prompts and
+reports caller latency, how many upstream calls were made (the rest were
+coalesced), deadline fallbacks, and the stub's peak concurrency.
+
+Usage:
+    python backend/stub_llm_server.py --delay 1.0 &
+    python backend/benchmark_gateway.py --requests 50 --distinct 5 --max-concurrency 2 --timeout 3
+"""
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_gateway import HTTPLLMClient, LLMGateway
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5099/generate")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--distinct", type=int, default=5)
+    parser.add_argument("--max-concurrency", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=3.0)
+    args = parser.parse_args()
+
+    gateway = LLMGateway(HTTPLLMClient(args.url), max_concurrency=args.max_concurrency, timeout=args.timeout)
+
+    def call(i):
+        started = time.perf_counter()
+        text = gateway.generate(f"prompt {i % args.distinct}", fallback=None)
+        return (time.perf_counter() - started) * 1000, text is not None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.requests) as pool:
+        results = list(pool.map(call, range(args.requests)))
+    total_s = time.perf_counter() - started
+
+    latencies = sorted(ms for ms, _ in results)
+    stats = gateway.stats()
+    with urllib.request.urlopen(args.url.rsplit("/", 1)[0] + "/stats") as response:
+        stub = json.loads(response.read())
+
+    print(f"{args.requests} calls over {args.distinct} prompts in {total_s:.2f}s")
+    print(f"answered: {sum(ok for _, ok in results)}, fallbacks: {stats['timeouts'] + stats['errors']}")
+    print(f"upstream calls: {stats['upstream']}, coalesced: {stats['coalesced']}")
+    print(f"caller latency p50 {latencies[len(latencies) // 2]:.0f} ms, "
+          f"p95 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:.0f} ms")
+    print(f"stub: {stub['requests']} requests total, peak concurrency {stub['max_in_flight']}")
+
+
+if __name__ == "__main__":
+    main()
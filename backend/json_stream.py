@@ -0,0 +1,78 @@
+import json
+
+
+class NodeStreamParser:
+    """Incrementally pull complete objects out of a streamed ``{"nodes": [...]}`` response.
+
+    Feed raw model output in arbitrary chunks; ``feed`` returns every object
+    of the ``nodes`` array that was closed by the chunk, already parsed. Text
+    before the JSON (prose, markdown fences) is skipped, braces inside strings
+    are ignored, and an element that is not valid JSON on its own is dropped
+    instead of failing the stream.
+    """
+
+    def __init__(self, array_key="nodes"):
+        self.marker = f'"{array_key}"'
+        self.buffer = ""
+        self.pos = 0
+        self.in_array = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.start = None
+        self.done = False
+        self.dropped = 0
+
+    def feed(self, chunk):
+        found = []
+        if self.done:
+            return found
+        self.buffer += chunk
+
+        if not self.in_array:
+            marker_at = self.buffer.find(self.marker, self.pos)
+            bracket_at = self.buffer.find("[", marker_at + len(self.marker)) if marker_at != -1 else -1
+            if bracket_at == -1:
+                # Rescan from the marker, or from just before the end so a marker split across chunks is found
+                self.pos = marker_at if marker_at != -1 else max(self.pos, len(self.buffer) - len(self.marker))
+                return found
+            self.in_array = True
+            self.pos = bracket_at + 1
+
+        buffer = self.buffer
+        for i in range(self.pos, len(buffer)):
+            char = buffer[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                if self.depth == 0:
+                    self.start = i
+                self.depth += 1
+            elif char == "}" and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    try:
+                        found.append(json.loads(buffer[self.start:i + 1]))
+                    except ValueError:
+                        self.dropped += 1
+                    self.start = None
+            elif char == "]" and self.depth == 0:
+                self.done = True
+                self.buffer = ""
+                return found
+        self.pos = len(buffer)
+
+        # Drop text that can no longer be part of an element
+        keep_from = self.start if self.start is not None else self.pos
+        self.buffer = buffer[keep_from:]
+        self.pos -= keep_from
+        if self.start is not None:
+            self.start = 0
+        return found
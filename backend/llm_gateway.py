@@ -0,0 +1,219 @@
+import asyncio
+import json
+import queue
+import threading
+import urllib.request
+
+_END = object()
+
+
+async def iterate_in_thread(make_iterator):
+    """Async-iterate a blocking iterator, advancing it on a worker thread."""
+    loop = asyncio.get_running_loop()
+    chunks = asyncio.Queue()
+
+    def pump():
+        try:
+            for item in make_iterator():
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+            loop.call_soon_threadsafe(chunks.put_nowait, _END)
+        except Exception as e:
+            loop.call_soon_threadsafe(chunks.put_nowait, e)
+
+    threading.Thread(target=pump, name="llm-stream", daemon=True).start()
+    while True:
+        item = await chunks.get()
+        if item is _END:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+class GeminiClient:
+    """Async text generation with a google.generativeai GenerativeModel."""
+
+    def __init__(self, model):
+        self.model = model
+
+    async def generate(self, prompt):
+        if hasattr(self.model, "generate_content_async"):
+            response = await self.model.generate_content_async(prompt)
+        else:
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+        return response.text
+
+    async def stream(self, prompt):
+        """Yield text chunks as the model produces them."""
+        if hasattr(self.model, "generate_content_async"):
+            response = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                yield chunk.text
+        else:
+            async for chunk in iterate_in_thread(lambda: self.model.generate_content(prompt, stream=True)):
+                yield chunk.text
+
+
+class HTTPLLMClient:
+    """Client for a simple HTTP LLM endpoint such as stub_llm_server.py.
+
+    POSTs ``{"prompt": ...}`` and expects ``{"text": ...}`` back; with
+    ``"stream": true`` the response body is the raw text, sent incrementally.
+    """
+
+    def __init__(self, url, request_timeout=60):
+        self.url = url
+        self.request_timeout = request_timeout
+
+    async def generate(self, prompt):
+        return await asyncio.to_thread(self._post, prompt)
+
+    async def stream(self, prompt):
+        async for chunk in iterate_in_thread(lambda: self._post_stream(prompt)):
+            yield chunk
+
+    def _request(self, payload):
+        return urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+
+    def _post(self, prompt):
+        with urllib.request.urlopen(self._request({"prompt": prompt}), timeout=self.request_timeout) as response:
+            return json.loads(response.read())["text"]
+
+    def _post_stream(self, prompt):
+        request = self._request({"prompt": prompt, "stream": True})
+        with urllib.request.urlopen(request, timeout=self.request_timeout) as response:
+            while True:
+                chunk = response.read1(4096)
+                if not chunk:
+                    return
+                yield chunk.decode("utf-8", errors="replace")
+
+
+class LLMGateway:
+    """Bounded, deduplicated access to an LLM from synchronous request handlers.
+
+    Calls run on a private asyncio loop thread. At most ``max_concurrency``
+    upstream calls are in flight (a semaphore); identical prompts that are
+    already in flight share the one upstream call (single-flight); each
+    caller waits at most ``timeout`` seconds and then gets ``fallback``.
+    An upstream call that outlives every waiter is still cut off after
+    ``upstream_timeout`` so it cannot hold a semaphore slot indefinitely.
+    """
+
+    def __init__(self, client, max_concurrency=4, timeout=20.0, upstream_timeout=60.0):
+        self.client = client
+        self.timeout = timeout
+        self.upstream_timeout = upstream_timeout
+        self.in_flight = {}
+        self.counts = {"calls": 0, "upstream": 0, "coalesced": 0, "timeouts": 0, "errors": 0, "streams": 0}
+        self.lock = threading.Lock()
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="llm-gateway", daemon=True)
+        self.thread.start()
+        self.semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(max_concurrency), self.loop).result()
+
+    @staticmethod
+    async def _make_semaphore(max_concurrency):
+        return asyncio.Semaphore(max_concurrency)
+
+    def generate(self, prompt, timeout=None, fallback=None):
+        """Blocking call for request handlers; returns the text, or ``fallback`` on deadline or error."""
+        timeout = self.timeout if timeout is None else timeout
+        future = asyncio.run_coroutine_threadsafe(self.generate_async(prompt, timeout, fallback), self.loop)
+        return future.result()
+
+    async def generate_async(self, prompt, timeout=None, fallback=None):
+        timeout = self.timeout if timeout is None else timeout
+        self._count("calls")
+        task = self.in_flight.get(prompt)
+        if task is None:
+            task = self.loop.create_task(self._upstream(prompt))
+            self.in_flight[prompt] = task
+            task.add_done_callback(lambda done: self._finished(prompt, done))
+        else:
+            self._count("coalesced")
+
+        try:
+            # shield: one caller's deadline must not cancel the call other callers share
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            print(f"LLM call exceeded {timeout:.1f}s deadline; using fallback")
+            return fallback
+        except Exception as e:
+            self._count("errors")
+            print(f"LLM call failed: {str(e)}")
+            return fallback
+
+    def stream(self, prompt, timeout=None):
+        """Blocking generator of text chunks for request handlers.
+
+        Streams share the concurrency limit but are not coalesced. The whole
+        stream must finish within ``timeout`` seconds; on deadline or error it
+        simply ends early, so callers keep whatever arrived.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        chunks = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._pump(prompt, timeout, chunks), self.loop)
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is _END:
+                    return
+                yield chunk
+        finally:
+            # The consumer may stop early (e.g. the client disconnected)
+            future.cancel()
+
+    async def _pump(self, prompt, timeout, chunks):
+        self._count("streams")
+        try:
+            await asyncio.wait_for(self._stream_into(prompt, chunks), timeout)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            print(f"LLM stream exceeded {timeout:.1f}s deadline; ending early")
+        except Exception as e:
+            self._count("errors")
+            print(f"LLM stream failed: {str(e)}")
+        finally:
+            chunks.put(_END)
+
+    async def _stream_into(self, prompt, chunks):
+        async with self.semaphore:
+            self._count("upstream")
+            async for chunk in self.client.stream(prompt):
+                chunks.put(chunk)
+
+    async def _upstream(self, prompt):
+        async with self.semaphore:
+            self._count("upstream")
+            return await asyncio.wait_for(self.client.generate(prompt), self.upstream_timeout)
+
+    def _finished(self, prompt, task):
+        self.in_flight.pop(prompt, None)
+        # Retrieve the outcome so an error nobody waited for is not reported as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def _count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, in_flight=len(self.in_flight))
+
+    def close(self):
+        def shutdown():
+            for task in list(self.in_flight.values()):
+                task.cancel()
+            # Let the cancellations run before stopping the loop
+            self.loop.call_soon(self.loop.stop)
+
+        self.loop.call_soon_threadsafe(shutdown)
+        self.thread.join(timeout=2)
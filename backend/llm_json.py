@@ -0,0 +1,405 @@
+import json
+import re
+import threading
+
+# Schemas are plain dicts: {"type": ..., "properties": {...}, "required": [...], "items": {...}, "minItems": n}
+ENRICHMENT_SCHEMA = {
+    "type": "object",
+    "required": ["nodes"],
+    "properties": {
+        "nodes": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["id"],
+                "properties": {
+                    "id": {"type": "string"},
+                    "description": {"type": "string"},
+                    "recommendations": {"type": "array", "items": {"type": "string"}},
+                },
+            },
+        },
+    },
+}
+
+STATS_SCHEMA = {
+    "type": "object",
+    "required": ["mudras", "dances", "poses", "score"],
+    "properties": {key: {"type": "integer"} for key in ("mudras", "dances", "poses", "score")},
+}
+
+POINT_SCHEMA = {"type": "array", "minItems": 3, "items": {"type": "number"}}
+
+ROADMAP_SCHEMA = {
+    "type": "object",
+    "required": ["nodes", "paths"],
+    "properties": {
+        "nodes": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["id", "title", "description", "recommendations", "isCompleted",
+                             "practiceLink", "timeRequired", "currentProgress", "projectedStats"],
+                "properties": {
+                    "id": {"type": "string"},
+                    "title": {"type": "string"},
+                    "description": {"type": "string"},
+                    "recommendations": {"type": "array", "items": {"type": "string"}},
+                    "isCompleted": {"type": "boolean"},
+                    "practiceLink": {"type": "string"},
+                    "timeRequired": {"type": "string"},
+                    "currentProgress": {"type": "number"},
+                    "projectedStats": STATS_SCHEMA,
+                },
+            },
+        },
+        "paths": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["start", "end", "isCompleted"],
+                "properties": {"start": POINT_SCHEMA, "end": POINT_SCHEMA, "isCompleted": {"type": "boolean"}},
+            },
+        },
+    },
+}
+
+_TYPE_CHECKS = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+}
+
+
+def compile_schema(schema):
+    """Compile a schema dict into ``check(value)``, which returns the first error message or None.
+
+    The schema is walked once here; validation is then a chain of closures
+    with no per-call schema interpretation.
+    """
+    return _compile(schema, "$")
+
+
+def _compile(schema, path):
+    type_check = _TYPE_CHECKS[schema["type"]]
+    type_name = schema["type"]
+
+    if type_name == "object":
+        required = tuple(schema.get("required", ()))
+        fields = tuple((name, _compile(sub, f"{path}.{name}")) for name, sub in schema.get("properties", {}).items())
+
+        def check(value):
+            if not type_check(value):
+                return f"{path} must be an object"
+            for name in required:
+                if name not in value:
+                    return f"{path}.{name} is missing"
+            for name, check_field in fields:
+                if name in value:
+                    error = check_field(value[name])
+                    if error:
+                        return error
+            return None
+        return check
+
+    if type_name == "array":
+        min_items = schema.get("minItems", 0)
+        check_item = _compile(schema["items"], f"{path}[]") if "items" in schema else None
+
+        def check(value):
+            if not type_check(value):
+                return f"{path} must be an array"
+            if len(value) < min_items:
+                return f"{path} needs at least {min_items} items"
+            if check_item:
+                for item in value:
+                    error = check_item(item)
+                    if error:
+                        return error
+            return None
+        return check
+
+    def check(value):
+        return None if type_check(value) else f"{path} must be a {type_name}"
+    return check
+
+
+class LLMJSONError(ValueError):
+    pass
+
+
+_FENCE = re.compile(r"```[\w-]*")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_DANGLING_KEY = re.compile(r'"(?:[^"\\]|\\.)*"\s*:$')
+_CURLY_QUOTES = "“”"
+_BARE_TAIL = re.compile(r"[\w.+-]+$")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_LITERALS = ("true", "false", "null") + tuple(_PY_LITERALS)
+
+
+def _normalize_quotes(text):
+    """Turn curly double quotes that delimit strings into '"'.
+
+    Only quotes met outside a string open or close one; curly quotes inside a
+    regular string are prose and kept, and a straight '"' inside a
+    curly-delimited string is escaped.
+    """
+    start = text.find("{")
+    if start == -1 or not any(quote in text for quote in _CURLY_QUOTES):
+        return text
+    out = [text[:start]]
+    in_string = escaped = curly = False
+    for char in text[start:]:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif curly and char in _CURLY_QUOTES:
+                char = '"'
+                in_string = False
+            elif curly and char == '"':
+                char = '\\"'
+            elif not curly and char == '"':
+                in_string = False
+        elif char in _CURLY_QUOTES:
+            char = '"'
+            in_string = curly = True
+        elif char == '"':
+            in_string = True
+            curly = False
+        out.append(char)
+    return "".join(out)
+
+
+def _finish_literal(token):
+    """Complete a bare literal cut off at the end (``tru``, ``nul``, ``1.``), or '' if nothing usable is left."""
+    for literal in _LITERALS:
+        if literal.startswith(token):
+            return literal
+    token = token.rstrip(".eE+-")
+    return token if _NUMBER.fullmatch(token) else ""
+
+
+def _balanced_object(text):
+    """Slice from the first '{' to its matching '}', ignoring braces inside strings.
+
+    Returns (json_text, closers) where ``closers`` are the brackets still open
+    if the text was cut off.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None, ""
+    stack = []
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+            if not stack:
+                return text[start:i + 1], ""
+    closers = ('"' if in_string else "") + "".join(reversed(stack))
+    return text[start:], closers
+
+
+def _close_truncated(text):
+    """Close JSON that was cut off: drop an incomplete trailing key, then close open strings and brackets.
+
+    A string is a key when it opens right after '{' or ',' inside an object.
+    A key cut off mid-way, or a complete key with no value yet, is removed
+    together with its separator, as is a container left empty by that; a
+    cut-off value string is closed, a cut-off bare literal is completed or
+    dropped, and complete values (including the last element of an array)
+    are kept.
+    """
+    stack = []
+    in_string = escaped = is_key = False
+    string_start = key_start = None
+    previous = ""
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                # A complete key stays droppable until its value starts
+                key_start = string_start if is_key else None
+                previous = '"'
+            continue
+        if char.isspace():
+            continue
+        if char == '"':
+            in_string = True
+            string_start = i
+            is_key = bool(stack) and stack[-1] == "}" and previous in "{,"
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+        if char != ":":
+            key_start = None
+        previous = char
+
+    if in_string and is_key:
+        text = text[:string_start]
+    elif in_string:
+        # A dangling backslash would escape the closing quote
+        text = (text[:-1] if escaped else text) + '"'
+    elif key_start is not None:
+        text = text[:key_start]
+    else:
+        text = text.rstrip()
+        tail = _BARE_TAIL.search(text)
+        if tail:
+            text = text[:tail.start()] + _finish_literal(tail.group())
+
+    # Drop trailing separators, containers left empty by the cut (e.g. a node with
+    # no complete field) and any key that thereby lost its value
+    text = text.rstrip()
+    while len(text) > 1:
+        if text.endswith(","):
+            text = text[:-1]
+        elif text.endswith(("{", "[")):
+            stack.pop()
+            text = text[:-1]
+        elif text.endswith(":") and _DANGLING_KEY.search(text):
+            text = text[:_DANGLING_KEY.search(text).start()]
+        else:
+            break
+        text = text.rstrip()
+    return text + "".join(reversed(stack))
+
+
+def _unquoted_literals(text, replace):
+    """Apply ``replace`` to the parts of ``text`` outside JSON strings."""
+    parts = re.split(r'("(?:[^"\\]|\\.)*")', text)
+    return "".join(part if i % 2 else replace(part) for i, part in enumerate(parts))
+
+
+def repair_json(text):
+    """Best-effort fix of common LLM JSON defects.
+
+    Handles surrounding prose and markdown fences, curly quotes used as
+    string delimiters, trailing commas, Python ``True``/``False``/``None`` and
+    output cut off before the closing brackets. Returns the candidate text,
+    or None if there is no object at all.
+    """
+    text = _normalize_quotes(_FENCE.sub("", text))
+    candidate, closers = _balanced_object(text)
+    if candidate is None:
+        return None
+    if closers:
+        candidate = _close_truncated(candidate)
+    candidate = _unquoted_literals(candidate, lambda part: re.sub(
+        r"\b(True|False|None)\b", lambda match: _PY_LITERALS[match.group(1)], part))
+    return _unquoted_literals(candidate, lambda part: _TRAILING_COMMA.sub(r"\1", part))
+
+
+class LLMJSONStats:
+    """Counters for JSON extraction from LLM output, to see how much LLM spend is wasted."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {"responses": 0, "clean": 0, "repaired": 0, "failures": 0, "retries": 0, "retry_successes": 0,
+                       "stream_node_failures": 0}
+
+    def record(self, outcome, count=1):
+        with self.lock:
+            self.counts[outcome] += count
+
+    def snapshot(self):
+        with self.lock:
+            result = dict(self.counts)
+        result["failure_rate"] = result["failures"] / result["responses"] if result["responses"] else 0.0
+        return result
+
+
+def parse_llm_json(text, check):
+    """Extract, repair if needed, and validate JSON from LLM output.
+
+    Returns ``(value, repaired)``; raises LLMJSONError describing the problem
+    when no valid value can be recovered.
+    """
+    if not text:
+        raise LLMJSONError("empty response")
+
+    # Fast path: well-formed output, possibly wrapped in prose or fences, parses in one C-level json.loads
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            value = json.loads(text[start:end + 1])
+        except ValueError:
+            pass
+        else:
+            error = check(value)
+            if error:
+                raise LLMJSONError(error)
+            return value, False
+
+    repaired = repair_json(text)
+    if repaired is None:
+        raise LLMJSONError("no JSON object found")
+    try:
+        value = json.loads(repaired)
+    except ValueError as e:
+        raise LLMJSONError(f"invalid JSON: {str(e)}")
+    error = check(value)
+    if error:
+        raise LLMJSONError(error)
+    return value, True
+
+
+def corrective_prompt(prompt, error):
+    """Prompt for the single retry after a response could not be parsed or validated."""
+    return (
+        prompt
+        + f"\n\nYour previous answer could not be used ({error}). "
+        + "Reply again with ONLY the JSON object, exactly matching the structure above: "
+        + "double-quoted keys and strings, no trailing commas, no comments, no markdown."
+    )
+
+
+def generate_json(generate, prompt, check, stats):
+    """Call ``generate(prompt)`` and parse its JSON, retrying once with a corrective prompt.
+
+    ``generate`` returns the response text or None (deadline/error; not
+    retried). Returns the validated value, or None.
+    """
+    for attempt in range(2):
+        text = generate(prompt)
+        if text is None:
+            return None
+        stats.record("responses")
+        try:
+            value, repaired = parse_llm_json(text, check)
+        except LLMJSONError as e:
+            stats.record("failures")
+            print(f"Unusable LLM JSON ({str(e)}): {text[:200]!r}")
+            if attempt == 0:
+                stats.record("retries")
+                prompt = corrective_prompt(prompt, e)
+            continue
+        stats.record("repaired" if repaired else "clean")
+        if attempt:
+            stats.record("retry_successes")
+        return value
+    return None
@@ -0,0 +1,140 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+
+
+def progress_signature(completed_mudras, completed_dances, completed_poses, total_score,
+                       count_bucket=1, score_bucket=50):
+    """Normalize user progress to bucket floors so near-identical states share LLM output.
+
+    Returns the normalized (mudras, dances, poses, score) tuple; prompts are
+    built from these values, so a cached result matches its key exactly.
+    """
+    def floor(value, bucket):
+        value = max(0, int(value or 0))
+        return value - value % bucket if bucket > 1 else value
+
+    return (
+        floor(completed_mudras, count_bucket),
+        floor(completed_dances, count_bucket),
+        floor(completed_poses, count_bucket),
+        floor(total_score, score_bucket),
+    )
+
+
+def cache_key(signature, prompt_version):
+    return f"v{prompt_version}:" + ":".join(str(value) for value in signature)
+
+
+class LatencyStats:
+    """Recent latencies (ms) per outcome, e.g. cache "hit" and "miss"."""
+
+    def __init__(self, window=1000):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.counts = defaultdict(int)
+
+    def record(self, outcome, duration_ms):
+        with self.lock:
+            self.samples[outcome].append(duration_ms)
+            self.counts[outcome] += 1
+
+    def snapshot(self):
+        with self.lock:
+            total = self.counts["hit"] + self.counts["miss"]
+            result = {
+                "hits": self.counts["hit"],
+                "misses": self.counts["miss"],
+                "hit_ratio": self.counts["hit"] / total if total else 0.0,
+            }
+            for outcome, samples in self.samples.items():
+                ordered = sorted(samples)
+                result[f"{outcome}_p50_ms"] = ordered[len(ordered) // 2] if ordered else None
+                result[f"{outcome}_p95_ms"] = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else None
+            return result
+
+
+class RoadmapCache:
+    """TTL + LRU cache of LLM roadmap output, optionally persisted to SQLite.
+
+    Lookups hit the in-process store first; with ``sqlite_path`` set, misses
+    fall back to the database (and are promoted into memory), so cached
+    results survive server restarts. The table is pruned as it is written:
+    expired rows are deleted at most every ``prune_interval`` seconds, and
+    beyond ``max_rows`` the rows closest to expiry go first.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=6 * 3600, sqlite_path=None, max_rows=10000,
+                 prune_interval=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.prune_interval = prune_interval
+        self.last_prune = time.monotonic()
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.db = None
+        if sqlite_path:
+            self.db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS roadmaps (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS roadmaps_expires_at ON roadmaps (expires_at)")
+            self._prune()
+            self.db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self.entries.move_to_end(key)
+                    return value
+                del self.entries[key]
+
+            if self.db is None:
+                return None
+            row = self.db.execute(
+                "SELECT value, expires_at FROM roadmaps WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            return value
+
+    def put(self, key, value):
+        expires_at = time.time() + self.ttl_seconds
+        with self.lock:
+            self._remember(key, value, expires_at)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO roadmaps (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at)
+                )
+                if time.monotonic() - self.last_prune >= self.prune_interval:
+                    self._prune()
+                self.db.commit()
+
+    def _prune(self):
+        """Delete expired rows, then the soonest-expiring rows beyond ``max_rows``."""
+        self.last_prune = time.monotonic()
+        self.db.execute("DELETE FROM roadmaps WHERE expires_at < ?", (time.time(),))
+        self.db.execute(
+            "DELETE FROM roadmaps WHERE key IN "
+            "(SELECT key FROM roadmaps ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,)
+        )
+
+    def _remember(self, key, value, expires_at):
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
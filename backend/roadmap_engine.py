@@ -0,0 +1,207 @@
+import copy
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CURRICULUM = os.path.join(os.path.dirname(os.path.abspath(__file__)), "curriculum.json")
+
+STAT_KEYS = ("mudras", "dances", "poses", "score")
+
+
+def load_curriculum(path=DEFAULT_CURRICULUM):
+    """Load the curriculum: ordered nodes with cumulative ``requirements`` per stat."""
+    with open(path, encoding="utf-8") as f:
+        curriculum = json.load(f)
+    for node in curriculum["nodes"]:
+        node["requirements"] = {key: int(node.get("requirements", {}).get(key, 0)) for key in STAT_KEYS}
+    return curriculum
+
+
+def parse_counter(value):
+    """Non-negative int from a request counter; missing counts as 0.
+
+    Raises ValueError for anything that is not a whole number, so handlers can
+    reject the request instead of failing inside the roadmap code.
+    """
+    if value is None or value == "":
+        return 0
+    if isinstance(value, bool):
+        raise ValueError(f"not a number: {value!r}")
+    if isinstance(value, str):
+        value = value.strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"not a number: {value!r}")
+    if not number.is_integer():
+        raise ValueError(f"not a whole number: {value!r}")
+    return max(0, int(number))
+
+
+def build_roadmap(curriculum, completed_mudras, completed_dances, completed_poses, total_score):
+    """Compute the roadmap for a user's progress without any LLM call.
+
+    A node is completed once every cumulative requirement is met;
+    ``currentProgress`` is the average completion (0-100) over the stats the
+    node requires, capped at 99 until then, and ``projectedStats`` are the
+    gains over the previous node. Returns the same {"nodes", "paths"}
+    structure the Dashboard renders.
+    """
+    progress = {
+        "mudras": parse_counter(completed_mudras),
+        "dances": parse_counter(completed_dances),
+        "poses": parse_counter(completed_poses),
+        "score": parse_counter(total_score),
+    }
+
+    nodes = []
+    previous = {key: 0 for key in STAT_KEYS}
+    for entry in curriculum["nodes"]:
+        requirements = entry["requirements"]
+        required = [key for key in STAT_KEYS if requirements[key] > 0]
+        is_completed = all(progress[key] >= requirements[key] for key in required)
+        ratios = [min(1.0, progress[key] / requirements[key]) for key in required]
+        current_progress = round(100 * sum(ratios) / len(ratios)) if ratios else 100
+        # Rounding must not show an unmet requirement (e.g. 990 of 1000) as done
+        if not is_completed:
+            current_progress = min(99, current_progress)
+
+        nodes.append({
+            "id": entry["id"],
+            "title": entry["title"],
+            "description": entry["description"],
+            "recommendations": list(entry["recommendations"]),
+            "isCompleted": is_completed,
+            "practiceLink": entry["practiceLink"],
+            "timeRequired": entry["timeRequired"],
+            "currentProgress": current_progress,
+            "projectedStats": {key: max(0, requirements[key] - previous[key]) for key in STAT_KEYS},
+        })
+        previous = requirements
+
+    entries = curriculum["nodes"]
+    paths = [
+        {
+            "start": list(entries[i].get("position", [0, i, 0])),
+            "end": list(entries[i + 1].get("position", [0, i + 1, 0])),
+            "isCompleted": nodes[i + 1]["isCompleted"],
+        }
+        for i in range(len(entries) - 1)
+    ]
+    return {"nodes": nodes, "paths": paths}
+
+
+def build_enrichment_prompt(roadmap, completed_mudras, completed_dances, completed_poses, total_score):
+    """Prompt asking the LLM only for personalized node text, keyed by node id."""
+    outline = "\n".join(
+        f"        - {node['id']}: {node['title']} "
+        + ("(completed)" if node["isCompleted"] else f"({node['currentProgress']}% done)")
+        for node in roadmap["nodes"]
+    )
+    return f"""
+        A Bharatanatyam student has completed {completed_mudras} mudras, {completed_dances} dance performances
+        and {completed_poses} poses, with a Guru Score of {total_score}. Their learning roadmap is:
+{outline}
+
+        For each node, write a one-sentence description and three short, specific practice
+        recommendations suited to the student's progress.
+
+        Return ONLY a valid JSON object with this exact structure, no additional text or formatting:
+        {{
+            "nodes": [
+                {{
+                    "id": "node1",
+                    "description": "...",
+                    "recommendations": ["...", "...", "..."]
+                }}
+            ]
+        }}
+        """
+
+
+def enrich_node(node, extra):
+    """Return a copy of ``node`` with the valid LLM fields of ``extra`` applied, or None if it has none."""
+    if not isinstance(extra, dict):
+        return None
+    enriched = copy.deepcopy(node)
+    changed = False
+    if isinstance(extra.get("description"), str) and extra["description"].strip():
+        enriched["description"] = extra["description"].strip()
+        changed = True
+    recommendations = extra.get("recommendations")
+    if isinstance(recommendations, list) and recommendations and all(isinstance(r, str) for r in recommendations):
+        enriched["recommendations"] = recommendations
+        changed = True
+    return enriched if changed else None
+
+
+def merge_enrichment(roadmap, enrichment):
+    """Return a copy of ``roadmap`` with LLM descriptions/recommendations merged in by node id."""
+    by_id = {node.get("id"): node for node in (enrichment or {}).get("nodes", []) if isinstance(node, dict)}
+    merged = copy.deepcopy(roadmap)
+    merged["nodes"] = [enrich_node(node, by_id.get(node["id"])) or node for node in merged["nodes"]]
+    return merged
+
+
+def missing_nodes(enrichment, node_ids):
+    """Node ids from ``node_ids`` that ``enrichment`` has no entry for, sorted."""
+    present = {node.get("id") for node in (enrichment or {}).get("nodes", []) if isinstance(node, dict)}
+    return sorted(set(node_ids) - present)
+
+
+class RoadmapEnricher:
+    """Runs LLM enrichment jobs in the background, one per cache key.
+
+    ``generate(prompt)`` returns the parsed enrichment dict; successful
+    results are stored in ``cache`` under the job's key, for the next request
+    with the same progress signature to merge in. Only an enrichment covering
+    every id in ``node_ids`` is cached, since a cached result is reused for
+    the whole TTL. A key whose job failed is not retried for ``retry_after``
+    seconds.
+    """
+
+    def __init__(self, generate, cache, node_ids=(), max_workers=2, retry_after=60):
+        self.generate = generate
+        self.cache = cache
+        self.node_ids = tuple(node_ids)
+        self.retry_after = retry_after
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="roadmap-enrich")
+        self.lock = threading.Lock()
+        self.in_flight = set()
+        self.failed_at = {}
+
+    def submit(self, key, prompt):
+        """Start enriching ``key`` unless a job for it is already running; returns True if started."""
+        with self.lock:
+            if key in self.in_flight:
+                return False
+            if time.monotonic() - self.failed_at.get(key, float("-inf")) < self.retry_after:
+                return False
+            self.in_flight.add(key)
+        self.executor.submit(self._run, key, prompt)
+        return True
+
+    def pending(self, key):
+        with self.lock:
+            return key in self.in_flight
+
+    def _run(self, key, prompt):
+        try:
+            enrichment = self.generate(prompt)
+            if not enrichment:
+                raise ValueError("empty enrichment")
+            missing = missing_nodes(enrichment, self.node_ids)
+            if missing:
+                raise ValueError(f"enrichment is missing nodes {', '.join(missing)}")
+            self.cache.put(key, enrichment)
+            with self.lock:
+                self.failed_at.pop(key, None)
+        except Exception as e:
+            print(f"Roadmap enrichment error: {str(e)}")
+            with self.lock:
+                self.failed_at[key] = time.monotonic()
+        finally:
+            with self.lock:
+                self.in_flight.discard(key)
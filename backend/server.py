@@ -1,10 +1,19 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import google.generativeai as genai
 import os
 import json
 from dotenv import load_dotenv
-import re
+import time
+
+from json_stream import NodeStreamParser
+from llm_gateway import GeminiClient, HTTPLLMClient, LLMGateway
+from llm_json import ENRICHMENT_SCHEMA, ROADMAP_SCHEMA, LLMJSONStats, compile_schema, generate_json
+from roadmap_cache import LatencyStats, RoadmapCache, cache_key, progress_signature
+from roadmap_engine import (
+    DEFAULT_CURRICULUM, RoadmapEnricher, build_enrichment_prompt, build_roadmap, enrich_node, load_curriculum,
+    merge_enrichment, missing_nodes, parse_counter
+)
 
 load_dotenv()
 
@@ -13,36 +22,129 @@ app = Flask(__name__)
 CORS(app, resources={
     r"/*": {
         "origins": ["http://localhost:5173"],  # Frontend URL
-        "methods": ["POST", "OPTIONS"],
+        "methods": ["GET", "POST", "OPTIONS"],
         "allow_headers": ["Content-Type"]
     }
 })
 
-# Configure Gemini API
+# Roadmap structure, progress and completion come from the curriculum file
+CURRICULUM = load_curriculum(os.getenv('ROADMAP_CURRICULUM', DEFAULT_CURRICULUM))
+CURRICULUM_NODE_IDS = [node["id"] for node in CURRICULUM["nodes"]]
+
+# Schemas are compiled once; a curriculum that cannot produce a valid roadmap fails at startup
+check_enrichment_schema = compile_schema(ENRICHMENT_SCHEMA)
+check_enrichment_node = compile_schema(ENRICHMENT_SCHEMA["properties"]["nodes"]["items"])
+roadmap_error = compile_schema(ROADMAP_SCHEMA)(build_roadmap(CURRICULUM, 0, 0, 0, 0))
+if roadmap_error:
+    raise ValueError(f"Curriculum produces an invalid roadmap: {roadmap_error}")
+
+# Configure Gemini API; without a key roadmaps are served without LLM enrichment
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment variables")
-
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-pro')
-
-def clean_json_response(text):
-    # Remove any text before the first '{'
-    start_idx = text.find('{')
-    if start_idx == -1:
-        return None
-    text = text[start_idx:]
-    
-    # Find the last '}' and remove anything after it
-    end_idx = text.rfind('}')
-    if end_idx == -1:
-        return None
-    text = text[:end_idx + 1]
-    
-    # Remove any markdown code block syntax
-    text = re.sub(r'```\w*\n?', '', text)
-    
-    return text.strip()
+model = None
+if GEMINI_API_KEY:
+    genai.configure(api_key=GEMINI_API_KEY)
+    model = genai.GenerativeModel('gemini-pro')
+
+# All LLM calls go through the gateway: deadline per call, bounded concurrency and
+# identical in-flight prompts coalesced. LLM_STUB_URL points it at stub_llm_server.py instead
+LLM_STUB_URL = os.getenv('LLM_STUB_URL')
+llm_client = HTTPLLMClient(LLM_STUB_URL) if LLM_STUB_URL else GeminiClient(model) if model else None
+gateway = None
+if llm_client:
+    gateway = LLMGateway(
+        llm_client,
+        max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', 4)),
+        timeout=float(os.getenv('LLM_TIMEOUT', 20))
+    )
+else:
+    print("Neither GEMINI_API_KEY nor LLM_STUB_URL is set; roadmap enrichment disabled")
+
+# Bump whenever the enrichment prompt or curriculum changes so cached LLM text is not reused
+PROMPT_VERSION = 2
+
+# LLM text depends only on the (bucketed) progress counters, so identical states reuse one generation
+ROADMAP_SCORE_BUCKET = int(os.getenv('ROADMAP_SCORE_BUCKET', 50))
+ROADMAP_COUNT_BUCKET = int(os.getenv('ROADMAP_COUNT_BUCKET', 1))
+roadmap_cache = RoadmapCache(
+    max_entries=int(os.getenv('ROADMAP_CACHE_SIZE', 256)),
+    ttl_seconds=float(os.getenv('ROADMAP_CACHE_TTL', 6 * 3600)),
+    sqlite_path=os.getenv('ROADMAP_CACHE_DB') or None,
+    max_rows=int(os.getenv('ROADMAP_CACHE_DB_ROWS', 10000))
+)
+roadmap_latency = LatencyStats()
+
+llm_json_stats = LLMJSONStats()
+
+def check_enrichment(enrichment):
+    """Schema check plus every curriculum node present, so truncated output takes the corrective retry."""
+    error = check_enrichment_schema(enrichment)
+    if error:
+        return error
+    missing = missing_nodes(enrichment, CURRICULUM_NODE_IDS)
+    return f"$.nodes is missing {', '.join(missing)}" if missing else None
+
+def call_llm(prompt):
+    started = time.perf_counter()
+    response_text = gateway.generate(prompt)
+    roadmap_latency.record("llm", (time.perf_counter() - started) * 1000)
+    return response_text
+
+def generate_enrichment(prompt):
+    """Ask the LLM for node descriptions/recommendations; None if no valid JSON came back.
+
+    Defects such as fences, trailing commas or truncation are repaired
+    locally; only output that cannot be repaired costs one corrective retry.
+    A deadline or upstream error is not retried; the local roadmap stays as is.
+    """
+    return generate_json(call_llm, prompt, check_enrichment, llm_json_stats)
+
+enricher = RoadmapEnricher(generate_enrichment, roadmap_cache, node_ids=CURRICULUM_NODE_IDS) if gateway else None
+
+def stream_roadmap(roadmap, key, prompt, started):
+    """NDJSON events: the local roadmap at once, then each node as soon as the LLM has written its text."""
+    def event(payload):
+        return json.dumps(payload) + "\n"
+
+    yield event({"type": "roadmap", "roadmap": roadmap})
+
+    nodes = {node["id"]: node for node in roadmap["nodes"]}
+    received = {}
+    first_node_ms = None
+    if prompt is not None:
+        parser = NodeStreamParser()
+        invalid_nodes = 0
+        for chunk in gateway.stream(prompt):
+            for extra in parser.feed(chunk):
+                if check_enrichment_node(extra):
+                    invalid_nodes += 1
+                    continue
+                node_id = extra["id"]
+                node = enrich_node(nodes[node_id], extra) if node_id in nodes and node_id not in received else None
+                if node is None:
+                    continue
+                if first_node_ms is None:
+                    first_node_ms = (time.perf_counter() - started) * 1000
+                    roadmap_latency.record("first_node", first_node_ms)
+                received[node_id] = extra
+                yield event({"type": "node", "node": node})
+
+        # Malformed and schema-invalid nodes are skipped, not retried
+        if parser.dropped + invalid_nodes:
+            llm_json_stats.record("stream_node_failures", parser.dropped + invalid_nodes)
+
+        # Only a complete enrichment is cached, so later requests merge all nodes at once
+        if len(received) == len(nodes):
+            roadmap_cache.put(key, {"nodes": list(received.values())})
+
+    total_ms = (time.perf_counter() - started) * 1000
+    if prompt is not None:
+        roadmap_latency.record("stream", total_ms)
+    yield event({
+        "type": "done",
+        "enrichedNodes": len(received),
+        "timeToFirstNodeMs": first_node_ms,
+        "totalMs": total_ms
+    })
 
 @app.route('/generate-roadmap', methods=['POST', 'OPTIONS'])
 def generate_roadmap():
@@ -57,103 +159,56 @@ def generate_roadmap():
                 "error": "No data provided"
             }), 400
 
-        completed_mudras = data.get('completedMudras', 0)
-        completed_dances = data.get('completedDances', 0)
-        completed_poses = data.get('completedPoses', 0)
-        total_score = data.get('totalScore', 0)
-
-        # Create prompt for Gemini
-        prompt = f"""
-        Create a JSON object representing a Bharatanatyam learning roadmap based on:
-        - Completed Mudras: {completed_mudras}
-        - Completed Dance Performances: {completed_dances}
-        - Completed Poses: {completed_poses}
-        - Total Guru Score: {total_score}
-
-        Return ONLY a valid JSON object with this exact structure, no additional text or formatting:
-        {{
-            "nodes": [
-                {{
-                    "id": "node1",
-                    "title": "Basic Mudras",
-                    "description": "Foundation hand gestures",
-                    "recommendations": [
-                        "Practice daily for 30 minutes",
-                        "Focus on finger flexibility",
-                        "Master basic positions"
-                    ],
-                    "isCompleted": false,
-                    "practiceLink": "/mudra-practice",
-                    "timeRequired": "30",
-                    "currentProgress": 45,
-                    "projectedStats": {{
-                        "mudras": 5,
-                        "dances": 2,
-                        "poses": 3,
-                        "score": 100
-                    }}
-                }}
-            ],
-            "paths": [
-                {{
-                    "start": [-2, 0, 0],
-                    "end": [0, 1, 0],
-                    "isCompleted": false
-                }}
-            ]
-        }}
-
-        Create exactly 6 nodes showing progression through Bharatanatyam skills.
-        Mark nodes as completed based on comparing their projectedStats with the user's current progress.
-        Include realistic timeRequired values in days (e.g., "30", "60", "90").
-        For each node, calculate currentProgress based on the user's completed items vs the node's requirements.
-        Include projectedStats showing how many new mudras, dances, poses, and score points will be gained.
-        Make sure the progression is logical and builds upon previous nodes.
-        Base completion status on whether the user has achieved the projected stats for that node.
-        """
-
         try:
-            response = model.generate_content(prompt)
-            response_text = response.text
-            
-            # Clean up the response text
-            cleaned_json = clean_json_response(response_text)
-            if not cleaned_json:
-                print(f"Failed to clean JSON response: {response_text}")
-                return jsonify({
-                    "success": False,
-                    "error": "Invalid response format from AI"
-                }), 500
-            
-            # Parse the JSON response
-            try:
-                roadmap_data = json.loads(cleaned_json)
-            except json.JSONDecodeError as e:
-                print(f"JSON parsing error: {str(e)}")
-                print(f"Cleaned response text: {cleaned_json}")
-                return jsonify({
-                    "success": False,
-                    "error": "Invalid JSON response from AI"
-                }), 500
-
-            # Validate the structure
-            if not isinstance(roadmap_data, dict) or 'nodes' not in roadmap_data or 'paths' not in roadmap_data:
-                return jsonify({
-                    "success": False,
-                    "error": "Invalid roadmap structure"
-                }), 500
-
-            return jsonify({
-                "success": True,
-                "roadmap": roadmap_data
-            })
-
-        except Exception as e:
-            print(f"Error generating content: {str(e)}")
+            completed_mudras = parse_counter(data.get('completedMudras', 0))
+            completed_dances = parse_counter(data.get('completedDances', 0))
+            completed_poses = parse_counter(data.get('completedPoses', 0))
+            total_score = parse_counter(data.get('totalScore', 0))
+        except ValueError as e:
             return jsonify({
                 "success": False,
-                "error": "Failed to generate content"
-            }), 500
+                "error": f"Invalid progress counter: {str(e)}"
+            }), 400
+
+        # The roadmap itself is computed locally in microseconds
+        started = time.perf_counter()
+        roadmap = build_roadmap(CURRICULUM, completed_mudras, completed_dances, completed_poses, total_score)
+
+        # Merge LLM-written text if it is ready; otherwise start it in the background
+        signature = progress_signature(
+            completed_mudras, completed_dances, completed_poses, total_score,
+            count_bucket=ROADMAP_COUNT_BUCKET, score_bucket=ROADMAP_SCORE_BUCKET
+        )
+        key = cache_key(signature, PROMPT_VERSION)
+        enrichment = roadmap_cache.get(key)
+
+        # Streaming mode: NDJSON, enriched nodes pushed one by one as the LLM writes them
+        if data.get('stream'):
+            prompt = None
+            if enrichment is not None:
+                roadmap = merge_enrichment(roadmap, enrichment)
+                roadmap_latency.record("hit", (time.perf_counter() - started) * 1000)
+            else:
+                if gateway:
+                    prompt = build_enrichment_prompt(build_roadmap(CURRICULUM, *signature), *signature)
+                roadmap_latency.record("miss", (time.perf_counter() - started) * 1000)
+            return Response(stream_roadmap(roadmap, key, prompt, started), mimetype='application/x-ndjson')
+
+        if enrichment is not None:
+            roadmap = merge_enrichment(roadmap, enrichment)
+            roadmap_latency.record("hit", (time.perf_counter() - started) * 1000)
+        else:
+            if enricher:
+                # Prompt from the bucketed progress, so the result matches its cache key
+                enricher.submit(key, build_enrichment_prompt(build_roadmap(CURRICULUM, *signature), *signature))
+            roadmap_latency.record("miss", (time.perf_counter() - started) * 1000)
+
+        return jsonify({
+            "success": True,
+            "roadmap": roadmap,
+            "enriched": enrichment is not None,
+            "enrichmentPending": bool(enricher and enricher.pending(key))
+        })
 
     except Exception as e:
         print(f"Server error: {str(e)}")
@@ -162,6 +217,16 @@ def generate_roadmap():
             "error": "Internal server error"
         }), 500
 
+@app.route('/roadmap-stats', methods=['GET'])
+def roadmap_stats():
+    stats = roadmap_latency.snapshot()
+    stats["cached_roadmaps"] = len(roadmap_cache)
+    stats["prompt_version"] = PROMPT_VERSION
+    stats["llm_json"] = llm_json_stats.snapshot()
+    if gateway:
+        stats["llm_gateway"] = gateway.stats()
+    return jsonify(stats)
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5005))
     app.run(debug=True, port=port) 
\ No newline at end of file
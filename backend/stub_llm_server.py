@@ -0,0 +1,110 @@
+"""Local stand-in for the LLM API, for exercising the gateway without network or API keys.
+
+POST /generate with {"prompt": "..."} returns {"text": "..."} after a
+configurable delay. The text is a valid roadmap enrichment for node1..node6,
+wrapped in a markdown code fence like real model output. With "stream": true
+the raw text is sent in small chunks spread over the delay instead, like a
+streaming model response. GET /stats returns request counts.
+
+Usage:
+    python backend/stub_llm_server.py --port 5099 --delay 2.0 --jitter 0.5 --fail-rate 0.1
+    LLM_STUB_URL=http://localhost:5099/generate python backend/server.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+lock = threading.Lock()
+counts = {"requests": 0, "failures": 0, "in_flight": 0, "max_in_flight": 0}
+
+
+def stub_enrichment(prompt):
+    nodes = [
+        {
+            "id": f"node{i}",
+            "description": f"Stub description {i} for a prompt of {len(prompt)} characters.",
+            "recommendations": [f"Stub recommendation {i}.{j}" for j in range(1, 4)],
+        }
+        for i in range(1, 7)
+    ]
+    return "Here is your roadmap:\n```json\n" + json.dumps({"nodes": nodes}, indent=2) + "\n```"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/stats":
+            self.send_error(404)
+            return
+        with lock:
+            self._reply(200, dict(counts))
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        prompt = body.get("prompt", "")
+
+        with lock:
+            counts["requests"] += 1
+            counts["in_flight"] += 1
+            counts["max_in_flight"] = max(counts["max_in_flight"], counts["in_flight"])
+        try:
+            delay = max(0.0, self.server.delay + random.uniform(-self.server.jitter, self.server.jitter))
+            if random.random() < self.server.fail_rate:
+                time.sleep(delay)
+                with lock:
+                    counts["failures"] += 1
+                self._reply(503, {"error": "stub failure"})
+                return
+            if body.get("stream"):
+                self._stream(stub_enrichment(prompt), delay)
+            else:
+                time.sleep(delay)
+                self._reply(200, {"text": stub_enrichment(prompt)})
+        finally:
+            with lock:
+                counts["in_flight"] -= 1
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, text, delay, chunk_size=40):
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.end_headers()
+        for chunk in chunks:
+            time.sleep(delay / len(chunks))
+            self.wfile.write(chunk.encode("utf-8"))
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--delay", type=float, default=2.0, help="Seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubHandler)
+    server.delay, server.jitter, server.fail_rate = args.delay, args.jitter, args.fail_rate
+    print(f"Stub LLM listening on http://127.0.0.1:{args.port}/generate")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import hashlib
+import logging
+import os
+import shutil
+import time
+
+from ultralytics import YOLO
+
+logger = logging.getLogger(__name__)
+
+# torch runs best.pt directly; the others are exported once and cached
+BACKENDS = ("torch", "onnx", "onnx-int8", "openvino")
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights", "exported")
+
+
+def weights_hash(weights_path, chunk_size=1 << 20):
+    """Short SHA-256 digest of a weights file, used to key exported artifacts."""
+    digest = hashlib.sha256()
+    with open(weights_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _export_raw_onnx(weights_path, imgsz):
+    """Export plain ONNX next to ``weights_path`` (ultralytics picks the name: ``best.pt`` -> ``best.onnx``)."""
+    return YOLO(weights_path).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+
+
+def _export_onnx(weights_path, target, imgsz):
+    exported = _export_raw_onnx(weights_path, imgsz)
+    try:
+        _optimize_onnx(exported, target)
+    finally:
+        os.remove(exported)
+
+
+def _optimize_onnx(source, target):
+    """Apply ONNX Runtime's offline graph optimizations and save the result."""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    # Extended rather than "all" keeps the saved graph portable across CPUs
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    options.optimized_model_filepath = target
+    ort.InferenceSession(source, options, providers=["CPUExecutionProvider"])
+
+
+def _export_onnx_int8(weights_path, target, imgsz):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    # Quantize the plain export rather than the runtime-optimized graph, whose fused
+    # contrib ops the quantizer does not handle; the intermediate file is only removed
+    # once quantization has read it
+    exported = _export_raw_onnx(weights_path, imgsz)
+    try:
+        quantize_dynamic(exported, target, weight_type=QuantType.QUInt8)
+    finally:
+        os.remove(exported)
+
+
+def _export_openvino(weights_path, target, imgsz):
+    exported = YOLO(weights_path).export(format="openvino", imgsz=imgsz)
+    shutil.move(exported, target)
+
+
+def export_model(weights_path, backend, cache_dir=DEFAULT_CACHE_DIR, imgsz=640):
+    """Return the path of ``weights_path`` converted for ``backend``.
+
+    The converted artifact is cached under ``cache_dir/<weights hash>/`` so it
+    is only rebuilt when the weights change.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+    if backend == "torch":
+        return weights_path
+
+    artifact_dir = os.path.join(cache_dir, weights_hash(weights_path))
+    names = {
+        "onnx": "best.opt.onnx",
+        "onnx-int8": "best.int8.onnx",
+        "openvino": "best_openvino_model",
+    }
+    target = os.path.join(artifact_dir, names[backend])
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(artifact_dir, exist_ok=True)
+    # Export next to the cache so the source weights directory stays untouched
+    staged = os.path.join(artifact_dir, os.path.basename(weights_path))
+    if not os.path.exists(staged):
+        shutil.copy2(weights_path, staged)
+
+    logger.info(f"Exporting {weights_path} for backend {backend}")
+    started = time.perf_counter()
+    if backend == "onnx":
+        _export_onnx(staged, target, imgsz)
+    elif backend == "onnx-int8":
+        _export_onnx_int8(staged, target, imgsz)
+    else:
+        _export_openvino(staged, target, imgsz)
+    logger.info(f"Exported {target} in {time.perf_counter() - started:.1f}s")
+    return target
+
+
+def load_model(weights_path, backend="torch", cache_dir=DEFAULT_CACHE_DIR, imgsz=640):
+    """Load the YOLO weights for the given inference backend."""
+    path = export_model(weights_path, backend, cache_dir=cache_dir, imgsz=imgsz)
+    logger.info(f"Loading {backend} model from: {path}")
+    return YOLO(path, task="detect")
+
+
+def _box_iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def compare_detections(reference, candidate, iou_threshold=0.5):
+    """Compare two detection lists (as produced by format_detections).
+
+    Reference detections are greedily matched to same-label candidates by
+    IoU. Returns the number of matched, missed and extra detections, the mean
+    IoU and confidence difference of the matches, and whether the most
+    confident label agrees.
+    """
+    unmatched = list(candidate)
+    ious = []
+    confidence_diffs = []
+    for ref in sorted(reference, key=lambda d: d["confidence"], reverse=True):
+        best, best_iou = None, iou_threshold
+        for cand in unmatched:
+            if cand["label"] != ref["label"]:
+                continue
+            iou = _box_iou(ref["box"], cand["box"])
+            if iou >= best_iou:
+                best, best_iou = cand, iou
+        if best is not None:
+            unmatched.remove(best)
+            ious.append(best_iou)
+            confidence_diffs.append(abs(best["confidence"] - ref["confidence"]))
+
+    def top_label(detections):
+        return max(detections, key=lambda d: d["confidence"])["label"] if detections else None
+
+    return {
+        "matched": len(ious),
+        "missed": len(reference) - len(ious),
+        "extra": len(unmatched),
+        "mean_iou": sum(ious) / len(ious) if ious else None,
+        "mean_confidence_diff": sum(confidence_diffs) / len(confidence_diffs) if confidence_diffs else None,
+        "top_label_agrees": top_label(reference) == top_label(candidate),
+    }
@@ -0,0 +1,132 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the batcher already holds its maximum number of pending frames."""
+
+
+class MicroBatcher:
+    """Groups frames submitted from many request threads into batched model calls.
+
+    A worker thread takes the first pending frame, then keeps collecting until
+    either ``max_batch_size`` frames are gathered or ``max_wait_ms`` has passed
+    since that first frame, runs ``detect_batch`` once on the whole batch and
+    resolves each caller's future with its own result.
+    """
+
+    def __init__(self, detect_batch, max_batch_size=8, max_wait_ms=10, max_queue_size=256):
+        self.detect_batch = detect_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.pending = queue.Queue(maxsize=max_queue_size)
+        self.batches = 0
+        self.frames = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="mudra-batcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+        # Fail frames that will never be processed instead of leaving callers to time out
+        while True:
+            try:
+                _, future = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    def submit(self, frame):
+        """Queue a frame and return a Future that resolves to its detections."""
+        future = Future()
+        try:
+            self.pending.put_nowait((frame, future))
+        except queue.Full:
+            raise QueueFullError("Too many frames waiting for inference")
+        return future
+
+    def detect(self, frame, timeout=None):
+        """Submit a frame and wait for its detections.
+
+        Raises concurrent.futures.TimeoutError on timeout; the frame is then
+        cancelled so it is skipped if it has not reached the model yet.
+        """
+        future = self.submit(frame)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def _collect(self):
+        try:
+            batch = [self.pending.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while self.running:
+            # Marks each future as running; futures whose caller already gave up are dropped
+            batch = [(frame, future) for frame, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            frames = [frame for frame, _ in batch]
+            futures = [future for _, future in batch]
+            started = time.perf_counter()
+            try:
+                results = self.detect_batch(frames)
+            except Exception as e:
+                logger.error(f"Error during batched detection: {str(e)}")
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.frames += len(frames)
+            logger.debug(
+                f"Batch of {len(frames)} frames took {(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+            results = list(results)
+            if len(results) != len(frames):
+                logger.error(f"detect_batch returned {len(results)} results for {len(frames)} frames")
+            for future, result in zip(futures, results):
+                future.set_result(result)
+            # Callers whose frame got no result must not wait for their timeout
+            for future in futures[len(results):]:
+                future.set_exception(RuntimeError("No detection result for frame"))
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "frames": self.frames,
+            "average_batch_size": round(self.frames / self.batches, 2) if self.batches else 0,
+            "pending": self.pending.qsize(),
+        }
@@ -0,0 +1,84 @@
+"""Benchmark mudra inference backends and check their accuracy against PyTorch.
+
+Usage:
+    python src/mudra/benchmark_backends.py --source public/1.mp4 --frames 200 \
+        --backends torch onnx onnx-int8
+"""
+import argparse
+import logging
+import statistics
+import time
+
+from backends import BACKENDS, compare_detections, load_model
+from capture import read_frames
+from inference import format_detections
+from model_registry import DEFAULT_WEIGHTS
+
+
+def run_backend(model, frames, warmup):
+    for frame in frames[:warmup]:
+        model(frame, verbose=False)
+
+    timings = []
+    outputs = []
+    for frame in frames:
+        started = time.perf_counter()
+        results = model(frame, verbose=False)[0]
+        timings.append((time.perf_counter() - started) * 1000)
+        outputs.append(format_detections(results))
+    return timings, outputs
+
+
+def summarize_parity(reference, candidate):
+    reports = [compare_detections(ref, cand) for ref, cand in zip(reference, candidate)]
+    matched = sum(r["matched"] for r in reports)
+    total = matched + sum(r["missed"] for r in reports)
+    ious = [r["mean_iou"] for r in reports if r["mean_iou"] is not None]
+    diffs = [r["mean_confidence_diff"] for r in reports if r["mean_confidence_diff"] is not None]
+    return {
+        "recall": matched / total if total else 1.0,
+        "extra": sum(r["extra"] for r in reports),
+        "top_label_agreement": sum(r["top_label_agrees"] for r in reports) / len(reports),
+        "mean_iou": statistics.mean(ious) if ious else None,
+        "mean_confidence_diff": statistics.mean(diffs) if diffs else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS)
+    parser.add_argument("--source", default="synthetic", help="Frame source spec (video path, image:<glob>, synthetic)")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx"], choices=BACKENDS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    frames = read_frames(args.source, args.frames)
+    if not frames:
+        parser.error(f"No frames could be read from {args.source}")
+    print(f"Benchmarking {len(frames)} frames from {args.source}")
+
+    # PyTorch is the accuracy reference, so it always runs first
+    backends = ["torch"] + [b for b in args.backends if b != "torch"]
+    reference = None
+    print(f"\n{'backend':<10} {'ms/frame':>9} {'p95 ms':>8} {'recall':>7} {'top-1':>6} {'IoU':>6} {'dconf':>6}")
+    for backend in backends:
+        model = load_model(args.weights, backend, imgsz=args.imgsz)
+        timings, outputs = run_backend(model, frames, args.warmup)
+        if reference is None:
+            reference = outputs
+        parity = summarize_parity(reference, outputs)
+
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+        mean_iou = f"{parity['mean_iou']:.3f}" if parity["mean_iou"] is not None else "-"
+        mean_diff = f"{parity['mean_confidence_diff']:.3f}" if parity["mean_confidence_diff"] is not None else "-"
+        print(
+            f"{backend:<10} {statistics.mean(timings):>9.2f} {p95:>8.2f} "
+            f"{parity['recall']:>7.3f} {parity['top_label_agreement']:>6.3f} {mean_iou:>6} {mean_diff:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Measure the latency/accuracy trade-off of hand-region cropping on a recorded clip.
+
+Every frame is run through the full-frame model (the accuracy reference) and
+through the two-stage ROI pipeline for each requested crop input size.
+
+Usage:
+    python src/mudra/benchmark_roi.py --source public/1.mp4 --roi-imgsz 224 320 416
+"""
+import argparse
+import logging
+import statistics
+import time
+
+from backends import BACKENDS, load_model
+from benchmark_backends import DEFAULT_WEIGHTS, summarize_parity
+from capture import read_frames
+from inference import format_detections
+from roi import RoiDetector, create_locator
+
+
+def time_calls(detect, frames):
+    timings = []
+    outputs = []
+    for frame in frames:
+        started = time.perf_counter()
+        outputs.append(detect(frame))
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS)
+    parser.add_argument("--backend", default="torch", choices=BACKENDS)
+    parser.add_argument("--source", required=True, help="Frame source spec, e.g. a video path")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--roi-imgsz", type=int, nargs="+", default=[320])
+    parser.add_argument("--padding", type=float, default=0.25)
+    parser.add_argument("--locator", default="track", choices=["track", "mediapipe"])
+    parser.add_argument("--refresh-interval", type=int, default=30)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    frames = read_frames(args.source, args.frames)
+    if not frames:
+        parser.error(f"No frames could be read from {args.source}")
+
+    model = load_model(args.weights, args.backend, imgsz=args.imgsz)
+    # Warm up both input sizes so neither run pays first-call costs
+    for imgsz in {args.imgsz, *args.roi_imgsz}:
+        model(frames[0], imgsz=imgsz, verbose=False)
+
+    full_timings, reference = time_calls(
+        lambda frame: format_detections(model(frame, imgsz=args.imgsz, verbose=False)[0]), frames
+    )
+
+    print(f"{len(frames)} frames from {args.source}, locator={args.locator}, padding={args.padding}")
+    print(f"\n{'pipeline':<14} {'ms/frame':>9} {'crop %':>7} {'recall':>7} {'top-1':>6} {'IoU':>6}")
+    print(f"{'full ' + str(args.imgsz):<14} {statistics.mean(full_timings):>9.2f} {0:>7.1f} {1:>7.3f} {1:>6.3f} {'-':>6}")
+
+    for roi_imgsz in args.roi_imgsz:
+        detector = RoiDetector(
+            lambda: model,
+            create_locator(args.locator),
+            imgsz=args.imgsz,
+            roi_imgsz=roi_imgsz,
+            padding=args.padding,
+            refresh_interval=args.refresh_interval,
+        )
+        timings, outputs = time_calls(detector, frames)
+        parity = summarize_parity(reference, outputs)
+        crop_share = 100 * detector.roi_frames / len(frames)
+        mean_iou = f"{parity['mean_iou']:.3f}" if parity["mean_iou"] is not None else "-"
+        print(
+            f"{'roi ' + str(roi_imgsz):<14} {statistics.mean(timings):>9.2f} {crop_share:>7.1f} "
+            f"{parity['recall']:>7.3f} {parity['top_label_agreement']:>6.3f} {mean_iou:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
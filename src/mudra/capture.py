@@ -0,0 +1,268 @@
+import collections
+import glob
+import logging
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CapturedFrame:
+    """A single frame together with when and in what order it was captured."""
+
+    __slots__ = ("image", "timestamp", "index")
+
+    def __init__(self, image, timestamp, index):
+        self.image = image
+        self.timestamp = timestamp
+        self.index = index
+
+    @property
+    def age(self):
+        """Seconds elapsed since the frame was captured."""
+        return time.time() - self.timestamp
+
+
+class CameraSource:
+    """Frames from a local webcam (or any device/URL cv2 can open)."""
+
+    def __init__(self, device=0):
+        self.device = device
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.device)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open camera {self.device}")
+
+    def read(self):
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class VideoFileSource:
+    """Frames from a recorded clip, optionally looped and paced to its FPS."""
+
+    def __init__(self, path, loop=True, realtime=True):
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.cap = None
+        self.frame_interval = 0
+        self.next_frame_at = 0
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video {self.path}")
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.frame_interval = 1.0 / fps if self.realtime else 0
+        self.next_frame_at = time.time()
+
+    def read(self):
+        if self.frame_interval:
+            delay = self.next_frame_at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_frame_at = max(self.next_frame_at + self.frame_interval, time.time())
+
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageFileSource:
+    """Frames from a still image or a directory/glob of images, cycled forever."""
+
+    def __init__(self, path, fps=30):
+        self.path = path
+        self.interval = 1.0 / fps if fps else 0
+        self.images = []
+        self.position = 0
+
+    def open(self):
+        if os.path.isdir(self.path):
+            paths = sorted(glob.glob(os.path.join(self.path, "*")))
+        else:
+            paths = sorted(glob.glob(self.path))
+        self.images = [img for img in (cv2.imread(p) for p in paths) if img is not None]
+        if not self.images:
+            raise RuntimeError(f"No readable images found at {self.path}")
+
+    def read(self):
+        if self.interval:
+            time.sleep(self.interval)
+        image = self.images[self.position % len(self.images)]
+        self.position += 1
+        return image.copy()
+
+    def close(self):
+        self.images = []
+
+
+class SyntheticSource:
+    """Generated frames with a moving square, for running without any camera."""
+
+    def __init__(self, width=640, height=480, fps=30):
+        self.width = width
+        self.height = height
+        self.interval = 1.0 / fps if fps else 0
+        self.count = 0
+
+    def open(self):
+        self.count = 0
+
+    def read(self):
+        if self.interval:
+            time.sleep(self.interval)
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        size = min(self.width, self.height) // 4
+        x = (self.count * 5) % max(self.width - size, 1)
+        y = (self.height - size) // 2
+        frame[y:y + size, x:x + size] = (255, 255, 255)
+        self.count += 1
+        return frame
+
+    def close(self):
+        pass
+
+
+def create_source(spec, realtime=True):
+    """Build a frame source from a spec string.
+
+    Accepted specs: ``camera`` / ``camera:<index>``, ``video:<path>``,
+    ``image:<path or glob>``, ``synthetic``. A bare integer is treated as a
+    camera index and any other bare value as a video path. With
+    ``realtime=False`` file and synthetic sources produce frames as fast as
+    they are read and videos are not looped, which suits benchmarks.
+    """
+    spec = str(spec).strip()
+    kind, _, arg = spec.partition(":")
+    fps = 30 if realtime else 0
+
+    if kind == "camera":
+        return CameraSource(int(arg) if arg else 0)
+    if kind == "video":
+        return VideoFileSource(arg, loop=realtime, realtime=realtime)
+    if kind == "image":
+        return ImageFileSource(arg, fps=fps)
+    if kind == "synthetic":
+        return SyntheticSource(fps=fps)
+    if spec.isdigit():
+        return CameraSource(int(spec))
+    return VideoFileSource(spec, loop=realtime, realtime=realtime)
+
+
+def read_frames(spec, count):
+    """Read up to ``count`` frames from a source spec without pacing."""
+    source = create_source(spec, realtime=False)
+    source.open()
+    frames = []
+    try:
+        while len(frames) < count:
+            frame = source.read()
+            if frame is None:
+                break
+            frames.append(frame)
+    finally:
+        source.close()
+    return frames
+
+
+class FrameCapture:
+    """Owns a frame source and keeps its most recent frames in a ring buffer.
+
+    A single background thread reads from the source as fast as it produces
+    frames, so callers never pay device open or warm-up costs and can pick up
+    the newest frame without blocking.
+    """
+
+    def __init__(self, source, buffer_size=8, reopen_delay=1.0):
+        self.source = source
+        self.buffer = collections.deque(maxlen=buffer_size)
+        self.reopen_delay = reopen_delay
+        self.frame_count = 0
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="frame-capture", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def _run(self):
+        while self.running:
+            try:
+                self.source.open()
+                logger.info(f"Frame source opened: {type(self.source).__name__}")
+            except Exception as e:
+                logger.error(f"Error opening frame source: {str(e)}")
+                time.sleep(self.reopen_delay)
+                continue
+
+            try:
+                while self.running:
+                    image = self.source.read()
+                    if image is None:
+                        logger.warning("Frame source returned no frame, reopening")
+                        break
+                    with self.condition:
+                        self.frame_count += 1
+                        self.buffer.append(CapturedFrame(image, time.time(), self.frame_count))
+                        self.condition.notify_all()
+            except Exception as e:
+                logger.error(f"Error reading from frame source: {str(e)}")
+            finally:
+                self.source.close()
+
+            if self.running:
+                time.sleep(self.reopen_delay)
+
+    def latest(self):
+        """Return the newest captured frame, or None if nothing was captured yet."""
+        with self.condition:
+            return self.buffer[-1] if self.buffer else None
+
+    def frames(self):
+        """Return a snapshot of the buffered frames, oldest first."""
+        with self.condition:
+            return list(self.buffer)
+
+    def wait_for_frame(self, after_index=0, timeout=None):
+        """Block until a frame newer than ``after_index`` is available."""
+        with self.condition:
+            self.condition.wait_for(
+                lambda: not self.running or (self.buffer and self.buffer[-1].index > after_index),
+                timeout=timeout,
+            )
+            if self.buffer and self.buffer[-1].index > after_index:
+                return self.buffer[-1]
+            return None
@@ -0,0 +1,38 @@
+# Production settings for mudra_bridge:
+#   gunicorn -c src/mudra/gunicorn.conf.py --chdir src/mudra mudra_bridge:app
+#
+# The app is imported once in the master with the weights loaded, so forked
+# workers share them copy-on-write instead of each loading them. The master runs
+# no inference: torch/OpenMP/MKL (and ONNX Runtime) thread pools created before
+# fork() are not valid in the children and can deadlock them, so each worker
+# runs the warm-up inference itself after forking.
+import gc
+import os
+import sys
+
+os.environ.setdefault("MUDRA_MODEL_LOADING", "preload")
+
+bind = os.getenv("MUDRA_BIND", "127.0.0.1:5000")
+preload_app = True
+# One worker: each process starts its own frame capture and inference worker on
+# first use, so several workers would compete for the webcam and run inference
+# on the same frames more than once. Only raise this when serving uploaded
+# frames (/detect) without the camera endpoints.
+workers = int(os.getenv("MUDRA_WORKERS", 1))
+# Threads keep long-lived /stream_detections connections from starving other requests
+worker_class = "gthread"
+threads = int(os.getenv("MUDRA_THREADS", 8))
+timeout = 60
+
+
+def when_ready(server):
+    # Move everything allocated while preloading out of the GC's tracked
+    # generations, so collections in workers don't touch (and copy) those pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # The preloaded app module; warming up here creates the thread pools in the worker
+    bridge = sys.modules.get("mudra_bridge")
+    if bridge is not None:
+        bridge.model_registry.warm_up()
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+
+import supervision as sv
+
+logger = logging.getLogger(__name__)
+
+
+def format_detections(results):
+    """Convert one ultralytics result into labels, confidence scores and boxes."""
+    # Convert predictions to supervision Detections
+    detections = sv.Detections.from_ultralytics(results)
+
+    detected_mudras = [
+        {
+            "label": results.names[class_id],
+            "confidence": float(confidence),
+            "box": [round(float(v), 1) for v in box]
+        }
+        for class_id, confidence, box in zip(detections.class_id, detections.confidence, detections.xyxy)
+    ]
+    logger.debug(f"Detected mudras: {detected_mudras}")
+    return detected_mudras
+
+
+class DetectionSnapshot:
+    """Immutable result of running the model on one captured frame."""
+
+    __slots__ = ("version", "detections", "frame_index", "frame_timestamp", "inference_ms", "completed_at", "state")
+
+    def __init__(self, version, detections, frame_index, frame_timestamp, inference_ms, completed_at, state=None):
+        self.version = version
+        self.detections = detections
+        self.frame_index = frame_index
+        self.frame_timestamp = frame_timestamp
+        self.inference_ms = inference_ms
+        self.completed_at = completed_at
+        self.state = state
+
+    def to_dict(self):
+        result = {
+            "version": self.version,
+            "detections": self.detections,
+            "frame_index": self.frame_index,
+            "frame_timestamp": self.frame_timestamp,
+            "frame_age_ms": round((time.time() - self.frame_timestamp) * 1000, 1),
+            "inference_ms": round(self.inference_ms, 1),
+        }
+        if self.state is not None:
+            result["state"] = self.state
+        return result
+
+
+class InferenceWorker:
+    """Continuously runs ``detect`` on the newest frame from a FrameCapture.
+
+    Every frame is inferred at most once, however many clients are reading
+    the results; readers get the latest published DetectionSnapshot and can
+    block until a version newer than the one they already have is ready.
+    If a ``tracker`` is given, its smoothed state is published alongside.
+    """
+
+    def __init__(self, capture, detect, tracker=None, idle_timeout=1.0):
+        self.capture = capture
+        self.detect = detect
+        self.tracker = tracker
+        self.idle_timeout = idle_timeout
+        self.snapshot = None
+        self.version = 0
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="mudra-inference", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def _run(self):
+        last_index = 0
+        while self.running:
+            frame = self.capture.wait_for_frame(after_index=last_index, timeout=self.idle_timeout)
+            if frame is None:
+                continue
+            last_index = frame.index
+
+            started = time.perf_counter()
+            try:
+                detections = self.detect(frame.image)
+            except Exception as e:
+                logger.error(f"Error during detection: {str(e)}")
+                continue
+            inference_ms = (time.perf_counter() - started) * 1000
+            state = self.tracker.update(detections, frame.timestamp) if self.tracker is not None else None
+
+            with self.condition:
+                self.version += 1
+                self.snapshot = DetectionSnapshot(
+                    self.version, detections, frame.index, frame.timestamp, inference_ms, time.time(), state
+                )
+                self.condition.notify_all()
+
+    def latest(self):
+        """Return the most recent snapshot, or None before the first inference."""
+        with self.condition:
+            return self.snapshot
+
+    def wait_for_snapshot(self, after_version=0, timeout=None):
+        """Block until a snapshot newer than ``after_version`` exists.
+
+        Returns the newest snapshot, which is still the old one if the
+        timeout expired first (or None if nothing was ever published).
+        """
+        with self.condition:
+            self.condition.wait_for(
+                lambda: not self.running or (self.snapshot is not None and self.snapshot.version > after_version),
+                timeout=timeout,
+            )
+            return self.snapshot
@@ -0,0 +1,118 @@
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from backends import load_model
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights", "best.pt")
+
+
+class ModelRegistry:
+    """Loads the mudra model once, on demand or in the background.
+
+    ``get()`` returns the loaded model, blocking until loading finishes if it
+    is still in progress. Loading ends with a warm-up inference on a blank
+    frame so kernel selection and lazy initialization are not paid by the
+    first real request. Load time and first-inference latency are logged and
+    exposed through ``status()``.
+
+    ``load(warmup=False)`` skips the warm-up so a preforking master never runs
+    inference (whose thread pools do not survive ``fork()``); each worker then
+    calls ``warm_up()`` after forking.
+    """
+
+    def __init__(self, weights_path=DEFAULT_WEIGHTS, backend="torch", imgsz=640):
+        self.weights_path = weights_path
+        self.backend = backend
+        self.imgsz = imgsz
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self.warmup_ms = None
+        self.lock = threading.Lock()
+        self.loaded = threading.Event()
+        self.thread = None
+
+    def load(self, warmup=True):
+        """Load and warm up the model in the calling thread (no-op if already loaded)."""
+        with self.lock:
+            if self.model is not None:
+                return self.model
+
+            logger.info(f"Loading model from: {self.weights_path}")
+            logger.info(f"File exists: {os.path.exists(self.weights_path)}")
+            started = time.perf_counter()
+            try:
+                model = load_model(self.weights_path, self.backend, imgsz=self.imgsz)
+                self.load_seconds = time.perf_counter() - started
+                if warmup:
+                    self._warm_up(model)
+            except Exception as e:
+                self.error = str(e)
+                logger.error(f"Error loading model: {str(e)}")
+                self.loaded.set()
+                raise
+
+            self.model = model
+            self.error = None
+            self.loaded.set()
+            logger.info(f"Model loaded successfully in {self.load_seconds:.2f}s (backend {self.backend})")
+            return model
+
+    def warm_up(self):
+        """Run the warm-up inference if loading skipped it (no-op otherwise)."""
+        with self.lock:
+            if self.model is not None and self.warmup_ms is None:
+                self._warm_up(self.model)
+
+    def _warm_up(self, model):
+        started = time.perf_counter()
+        model(np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8), verbose=False)
+        self.warmup_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Model warm-up inference took {self.warmup_ms:.1f} ms")
+
+    def load_in_background(self):
+        """Start loading in a daemon thread so the server can accept requests meanwhile."""
+        if self.thread is None and self.model is None:
+            self.thread = threading.Thread(target=self._load_quietly, name="model-loader", daemon=True)
+            self.thread.start()
+        return self
+
+    def _load_quietly(self):
+        try:
+            self.load()
+        except Exception:
+            pass
+
+    def get(self, timeout=None):
+        """Return the model, loading it now if nobody has started yet.
+
+        A failed background load is retried in the calling thread.
+        """
+        if self.model is not None:
+            return self.model
+        if self.thread is None or (self.loaded.is_set() and self.model is None):
+            return self.load()
+        if not self.loaded.wait(timeout):
+            raise RuntimeError("Model is still loading")
+        return self.get()
+
+    @property
+    def ready(self):
+        return self.model is not None
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "loading": self.thread is not None and not self.loaded.is_set(),
+            "backend": self.backend,
+            "weights": self.weights_path,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "first_inference_ms": round(self.warmup_ms, 1) if self.warmup_ms is not None else None,
+            "error": self.error,
+        }
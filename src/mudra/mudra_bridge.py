@@ -1,17 +1,28 @@
 from flask import Flask, Response, jsonify, request
 import cv2
 import supervision as sv
-from ultralytics import YOLO
 import os
 import json
+import time
+import numpy as np
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from flask_cors import CORS
 import logging
 
+from capture import FrameCapture, create_source
+from inference import InferenceWorker, format_detections
+from batching import MicroBatcher, QueueFullError
+from model_registry import DEFAULT_WEIGHTS, ModelRegistry
+from roi import RoiDetector, create_locator
+from tracking import MudraTracker, SessionTrackers
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = 8 * 1024 * 1024
 # Configure CORS to allow requests from React development server
 CORS(app, resources={
     r"/*": {
@@ -21,57 +32,215 @@ CORS(app, resources={
     }
 })
 
-# Load the model
-weights_path = os.path.join(os.getcwd(), "src", "mudra", "weights", "best.pt")
-logger.info(f"Loading model from: {weights_path}")
-logger.info(f"File exists: {os.path.exists(weights_path)}")
+# Model loading: weights resolve relative to this file, and the model is loaded
+# eagerly, in the background, lazily on first use, or (``preload``, for a
+# preforking master) eagerly but without the warm-up inference, which each
+# worker runs after forking, depending on MUDRA_MODEL_LOADING
+startup_started = time.perf_counter()
+MODEL_WEIGHTS = os.getenv("MUDRA_WEIGHTS", DEFAULT_WEIGHTS)
+MODEL_BACKEND = os.getenv("MUDRA_BACKEND", "torch")
+MODEL_IMGSZ = int(os.getenv("MUDRA_IMGSZ", 640))
+MODEL_LOADING = os.getenv("MUDRA_MODEL_LOADING", "background")
 
-try:
-    model = YOLO(weights_path)
-    logger.info("Model loaded successfully")
-except Exception as e:
-    logger.error(f"Error loading model: {str(e)}")
-    raise
+model_registry = ModelRegistry(MODEL_WEIGHTS, backend=MODEL_BACKEND, imgsz=MODEL_IMGSZ)
+if MODEL_LOADING == "eager":
+    model_registry.load()
+elif MODEL_LOADING == "preload":
+    model_registry.load(warmup=False)
+elif MODEL_LOADING == "background":
+    model_registry.load_in_background()
 
 # Initialize annotators
 box_annotator = sv.BoxAnnotator()
 label_annotator = sv.LabelAnnotator()
 
+# Frame capture: the device is opened once and read continuously in the background,
+# and a single inference worker publishes the latest detections for all clients
+FRAME_SOURCE = os.getenv("MUDRA_FRAME_SOURCE", "camera:0")
+FRAME_BUFFER_SIZE = int(os.getenv("MUDRA_FRAME_BUFFER", 8))
+FIRST_FRAME_TIMEOUT = float(os.getenv("MUDRA_FIRST_FRAME_TIMEOUT", 5))
+
+# Optional two-stage pipeline for the camera stream: locate the hand (previous
+# detection box with motion tracking, or MediaPipe Hands) and run YOLO on the crop
+ROI_LOCATOR = os.getenv("MUDRA_ROI", "off")
+ROI_IMGSZ = int(os.getenv("MUDRA_ROI_IMGSZ", 320))
+ROI_PADDING = float(os.getenv("MUDRA_ROI_PADDING", 0.25))
+ROI_REFRESH_INTERVAL = int(os.getenv("MUDRA_ROI_REFRESH_INTERVAL", 30))
+
+# Server-side temporal smoothing: per-session EMA of class confidences with
+# hysteresis on label changes, giving a stable current mudra and dwell time
+TRACK_TAU = float(os.getenv("MUDRA_TRACK_TAU", 0.5))
+TRACK_ENTER_THRESHOLD = float(os.getenv("MUDRA_TRACK_ENTER", 0.6))
+TRACK_EXIT_THRESHOLD = float(os.getenv("MUDRA_TRACK_EXIT", 0.4))
+TRACK_SESSION_TTL = float(os.getenv("MUDRA_TRACK_SESSION_TTL", 300))
+# ByteTrack is sized for the detection rate; unset means measure it per tracker
+TRACK_FRAME_RATE = int(os.getenv("MUDRA_TRACK_FRAME_RATE", 0)) or None
+tracker_options = {
+    "tau": TRACK_TAU,
+    "enter_threshold": TRACK_ENTER_THRESHOLD,
+    "exit_threshold": TRACK_EXIT_THRESHOLD,
+    "frame_rate": TRACK_FRAME_RATE
+}
+session_trackers = SessionTrackers(idle_ttl=TRACK_SESSION_TTL, **tracker_options)
+
+MAX_WAIT_TIMEOUT = float(os.getenv("MUDRA_MAX_WAIT_TIMEOUT", 10))
+STREAM_KEEPALIVE = float(os.getenv("MUDRA_STREAM_KEEPALIVE", 15))
+# Snapshot versions restart at 1 with each process, so event ids carry a per-process epoch
+STREAM_EPOCH = os.urandom(4).hex()
+
+# Uploaded frames from many sessions are grouped into a single model call
+BATCH_MAX_SIZE = int(os.getenv("MUDRA_BATCH_MAX_SIZE", 8))
+BATCH_MAX_WAIT_MS = float(os.getenv("MUDRA_BATCH_MAX_WAIT_MS", 10))
+BATCH_MAX_QUEUE = int(os.getenv("MUDRA_BATCH_MAX_QUEUE", 256))
+DETECT_TIMEOUT = float(os.getenv("MUDRA_DETECT_TIMEOUT", 10))
+
+frame_capture = None
+inference_worker = None
+batcher = None
+pipeline_lock = threading.Lock()
+
+def detect_mudras(frame):
+    """Run the model on a single frame"""
+    return format_detections(model_registry.get()(frame, verbose=False)[0])
+
+def detect_mudras_batch(frames):
+    """Run the model once on a list of frames, returning one result list per frame"""
+    return [format_detections(results) for results in model_registry.get()(frames, verbose=False)]
+
+def get_batcher():
+    """Start the shared micro-batcher for uploaded frames on first use"""
+    global batcher
+    with pipeline_lock:
+        if batcher is None:
+            batcher = MicroBatcher(
+                detect_mudras_batch,
+                max_batch_size=BATCH_MAX_SIZE,
+                max_wait_ms=BATCH_MAX_WAIT_MS,
+                max_queue_size=BATCH_MAX_QUEUE
+            ).start()
+        return batcher
+
+def get_inference_worker():
+    """Start the shared capture and inference threads on first use"""
+    global frame_capture, inference_worker
+    with pipeline_lock:
+        if inference_worker is None:
+            logger.info(f"Starting frame capture from: {FRAME_SOURCE}")
+            frame_capture = FrameCapture(create_source(FRAME_SOURCE), buffer_size=FRAME_BUFFER_SIZE).start()
+            detect = detect_mudras
+            if ROI_LOCATOR != "off":
+                logger.info(f"Using {ROI_LOCATOR} hand cropping at imgsz {ROI_IMGSZ}")
+                detect = RoiDetector(
+                    model_registry.get,
+                    create_locator(ROI_LOCATOR),
+                    imgsz=MODEL_IMGSZ,
+                    roi_imgsz=ROI_IMGSZ,
+                    padding=ROI_PADDING,
+                    refresh_interval=ROI_REFRESH_INTERVAL
+                )
+            inference_worker = InferenceWorker(frame_capture, detect, tracker=MudraTracker(**tracker_options)).start()
+        return inference_worker
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the model is loaded and warmed up, 503 before"""
+    status = model_registry.status()
+    return jsonify(status), 200 if status["ready"] else 503
+
 @app.route('/get_detections', methods=['GET', 'OPTIONS'])
 def get_detections():
     if request.method == 'OPTIONS':
         return jsonify({"status": "ok"})
-        
-    cap = cv2.VideoCapture(0)
-    ret, frame = cap.read()
-    cap.release()
     
-    if not ret:
-        logger.error("Failed to capture frame from camera")
+    # Clients may pass the last version they saw to wait for a newer result
+    after_version = request.args.get('after', default=0, type=int)
+    timeout = min(request.args.get('timeout', default=MAX_WAIT_TIMEOUT, type=float), MAX_WAIT_TIMEOUT)
+    
+    worker = get_inference_worker()
+    snapshot = worker.latest()
+    if snapshot is None:
+        snapshot = worker.wait_for_snapshot(timeout=FIRST_FRAME_TIMEOUT)
+    elif after_version:
+        snapshot = worker.wait_for_snapshot(after_version, timeout=timeout)
+    
+    if snapshot is None:
+        logger.error("No detections available yet")
         return jsonify({"error": "Failed to capture frame"})
     
+    return jsonify(snapshot.to_dict())
+
+@app.route('/detect', methods=['POST', 'OPTIONS'])
+def detect():
+    """Detect mudras in a JPEG/WebP frame uploaded by the browser.
+
+    The frame can be sent as the ``frame`` field of a multipart form or as the
+    raw request body. Frames from concurrent requests are micro-batched. If a
+    ``session`` id is given, the smoothed per-session state is returned too.
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({"status": "ok"})
+    
+    upload = request.files.get('frame')
+    data = upload.read() if upload else request.get_data()
+    if not data:
+        return jsonify({"error": "No frame provided"}), 400
+    
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        return jsonify({"error": "Could not decode frame"}), 400
+    
+    started = time.perf_counter()
     try:
-        # Make prediction
-        results = model(frame)[0]
-        logger.info(f"Model classes: {results.names}")
-        
-        # Convert predictions to supervision Detections
-        detections = sv.Detections.from_ultralytics(results)
-        
-        # Get labels and confidence scores
-        detected_mudras = [
-            {
-                "label": results.names[class_id],
-                "confidence": float(confidence)
-            }
-            for class_id, confidence in zip(detections.class_id, detections.confidence)
-        ]
-        
-        logger.info(f"Detected mudras: {detected_mudras}")
-        return jsonify({"detections": detected_mudras})
+        detected_mudras = get_batcher().detect(frame, timeout=DETECT_TIMEOUT)
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    except FutureTimeoutError:
+        return jsonify({"error": "Timed out waiting for detection"}), 504
     except Exception as e:
         logger.error(f"Error during detection: {str(e)}")
-        return jsonify({"error": str(e)})
+        return jsonify({"error": str(e)}), 500
+    
+    result = {
+        "detections": detected_mudras,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+    session_id = request.values.get('session')
+    if session_id:
+        result["state"] = session_trackers.update(session_id, detected_mudras)
+    return jsonify(result)
+
+@app.route('/stream_detections', methods=['GET'])
+def stream_detections():
+    """Push each new detection snapshot to the client as Server-Sent Events.
+
+    Every client waits for a version newer than the last one it was sent, so a
+    slow reader skips straight to the latest result instead of queueing up.
+    Event ids are ``<epoch>-<version>``; a Last-Event-ID from another process
+    (e.g. before a restart) is ignored and the client starts from the latest.
+    """
+    worker = get_inference_worker()
+    epoch, _, last_version = request.headers.get('Last-Event-ID', '').partition('-')
+    last_version = int(last_version) if epoch == STREAM_EPOCH and last_version.isdigit() else 0
+    
+    def generate():
+        version = last_version
+        yield "retry: 1000\n\n"
+        while worker.running:
+            snapshot = worker.wait_for_snapshot(version, timeout=STREAM_KEEPALIVE)
+            if snapshot is None or snapshot.version <= version:
+                # Comment line keeps proxies and the browser from timing out
+                yield ": keepalive\n\n"
+                continue
+            version = snapshot.version
+            yield f"id: {STREAM_EPOCH}-{version}\nevent: detections\ndata: {json.dumps(snapshot.to_dict())}\n\n"
+        # The worker stopped: end the stream and let the browser reconnect after the retry delay
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+logger.info(f"mudra_bridge initialized in {time.perf_counter() - startup_started:.2f}s (model loading: {MODEL_LOADING})")
 
 if __name__ == '__main__':
-    app.run(port=5000, debug=True) 
\ No newline at end of file
+    app.run(port=5000, debug=True, threaded=True) 
\ No newline at end of file
@@ -0,0 +1,153 @@
+import logging
+
+from inference import format_detections
+
+logger = logging.getLogger(__name__)
+
+
+class TrackedBoxLocator:
+    """Predicts the hand region from the previous frame's best detection.
+
+    The box centre is extrapolated with a constant-velocity estimate, and the
+    track is dropped after ``max_misses`` frames without a detection so the
+    next frame falls back to a full-frame pass.
+    """
+
+    def __init__(self, max_misses=3):
+        self.max_misses = max_misses
+        self.box = None
+        self.velocity = (0.0, 0.0)
+        self.misses = 0
+
+    def locate(self, frame):
+        if self.box is None:
+            return None
+        dx, dy = self.velocity
+        x1, y1, x2, y2 = self.box
+        return [x1 + dx, y1 + dy, x2 + dx, y2 + dy]
+
+    def update(self, box):
+        if box is None:
+            self.misses += 1
+            if self.misses >= self.max_misses:
+                self.reset()
+            return
+
+        if self.box is not None:
+            self.velocity = (
+                (box[0] + box[2] - self.box[0] - self.box[2]) / 2,
+                (box[1] + box[3] - self.box[1] - self.box[3]) / 2,
+            )
+        self.box = list(box)
+        self.misses = 0
+
+    def reset(self):
+        self.box = None
+        self.velocity = (0.0, 0.0)
+        self.misses = 0
+
+
+class MediaPipeHandLocator:
+    """Finds the hand with MediaPipe Hands, independently of the YOLO results."""
+
+    def __init__(self, max_num_hands=1, min_detection_confidence=0.5):
+        import mediapipe as mp
+
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_num_hands,
+            model_complexity=0,
+            min_detection_confidence=min_detection_confidence,
+        )
+
+    def locate(self, frame):
+        import cv2
+
+        results = self.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if not results.multi_hand_landmarks:
+            return None
+
+        height, width = frame.shape[:2]
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        return [min(xs) * width, min(ys) * height, max(xs) * width, max(ys) * height]
+
+    def update(self, box):
+        pass
+
+    def reset(self):
+        pass
+
+
+def create_locator(kind):
+    if kind == "track":
+        return TrackedBoxLocator()
+    if kind == "mediapipe":
+        return MediaPipeHandLocator()
+    raise ValueError(f"Unknown hand locator {kind!r}, expected 'track' or 'mediapipe'")
+
+
+def crop_region(frame, box, padding=0.25, min_size=96):
+    """Square crop around ``box`` grown by ``padding`` (fraction of its size).
+
+    Returns the crop and its (x, y) offset in the frame, or (None, None) if
+    the box lies outside the frame.
+    """
+    height, width = frame.shape[:2]
+    cx, cy = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+    side = max(box[2] - box[0], box[3] - box[1]) * (1 + 2 * padding)
+    side = min(max(side, min_size), width, height)
+
+    x1 = int(round(min(max(cx - side / 2, 0), width - side)))
+    y1 = int(round(min(max(cy - side / 2, 0), height - side)))
+    x2, y2 = x1 + int(side), y1 + int(side)
+    if x2 <= x1 or y2 <= y1:
+        return None, None
+    return frame[y1:y2, x1:x2], (x1, y1)
+
+
+class RoiDetector:
+    """Two-stage mudra detection: locate the hand, then run YOLO on the crop only.
+
+    The crop is inferred at ``roi_imgsz`` (smaller than the full-frame
+    ``imgsz``) and boxes are mapped back to frame coordinates. A full-frame
+    pass runs when no hand region is known and every ``refresh_interval``
+    frames, so new or fast-moving hands are picked up again.
+    """
+
+    def __init__(self, get_model, locator, imgsz=640, roi_imgsz=320, padding=0.25, refresh_interval=30):
+        self.get_model = get_model
+        self.locator = locator
+        self.imgsz = imgsz
+        self.roi_imgsz = roi_imgsz
+        self.padding = padding
+        self.refresh_interval = refresh_interval
+        self.frames_since_full = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+
+    def _run(self, image, imgsz):
+        return format_detections(self.get_model()(image, imgsz=imgsz, verbose=False)[0])
+
+    def __call__(self, frame):
+        box = None
+        if self.frames_since_full < self.refresh_interval:
+            box = self.locator.locate(frame)
+
+        crop, offset = crop_region(frame, box, self.padding) if box is not None else (None, None)
+        if crop is None:
+            detections = self._run(frame, self.imgsz)
+            self.frames_since_full = 0
+            self.full_frames += 1
+        else:
+            detections = self._run(crop, self.roi_imgsz)
+            ox, oy = offset
+            for detection in detections:
+                x1, y1, x2, y2 = detection["box"]
+                detection["box"] = [x1 + ox, y1 + oy, x2 + ox, y2 + oy]
+            self.frames_since_full += 1
+            self.roi_frames += 1
+
+        best = max(detections, key=lambda d: d["confidence"]) if detections else None
+        self.locator.update(best["box"] if best else None)
+        return detections
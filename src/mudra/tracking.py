@@ -0,0 +1,174 @@
+import math
+import threading
+import time
+
+import numpy as np
+import supervision as sv
+
+
+def box_iou(a, b):
+    """Pairwise IoU between two arrays of xyxy boxes."""
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-9)
+
+
+class MudraTracker:
+    """Turns noisy per-frame detections into a stable "current mudra".
+
+    Class confidences are smoothed with an exponential moving average whose
+    weight depends on the time between frames (time constant ``tau`` seconds),
+    so the behaviour is the same at any inference frame rate. The current
+    label only changes with hysteresis: a mudra must reach ``enter_threshold``
+    and beat the current one by ``switch_margin`` to take over, and the
+    current one is dropped once it decays below ``exit_threshold``. Boxes are
+    associated across frames with ByteTrack so each detection has a track ID.
+
+    ByteTrack's lost-track buffer is counted in frames, so it is built for the
+    detection rate: ``frame_rate`` if given, otherwise the rate measured from
+    the frame timestamps (it is rebuilt, restarting track IDs, if the measured
+    rate drifts by more than half).
+    """
+
+    def __init__(self, tau=0.5, enter_threshold=0.6, exit_threshold=0.4, switch_margin=0.1, frame_rate=None):
+        self.tau = tau
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.switch_margin = switch_margin
+        self.frame_rate = frame_rate
+        self.measured_interval = None
+        self.byte_tracker = sv.ByteTrack(frame_rate=frame_rate) if frame_rate else None
+        self.byte_tracker_rate = frame_rate
+        # Held by callers that feed one tracker from several threads
+        self.lock = threading.Lock()
+        self.class_ids = {}
+        self.scores = {}
+        self.current = None
+        self.current_since = None
+        self.current_track_id = None
+        self.last_timestamp = None
+
+    def _measure_rate(self, dt):
+        """Update the measured detection rate and (re)build ByteTrack for it if needed."""
+        if self.frame_rate or dt <= 0:
+            return
+        self.measured_interval = dt if self.measured_interval is None else (
+            self.measured_interval + 0.1 * (dt - self.measured_interval)
+        )
+        rate = max(1, round(1.0 / self.measured_interval))
+        if self.byte_tracker is None or not 2 / 3 <= rate / self.byte_tracker_rate <= 3 / 2:
+            self.byte_tracker = sv.ByteTrack(frame_rate=rate)
+            self.byte_tracker_rate = rate
+
+    def _track(self, detections):
+        """Attach ByteTrack IDs to the detections in place."""
+        if self.byte_tracker is None:
+            # Rate not known yet (first frame)
+            return
+        if not detections:
+            self.byte_tracker.update_with_detections(sv.Detections.empty())
+            return
+
+        for detection in detections:
+            self.class_ids.setdefault(detection["label"], len(self.class_ids))
+        tracked = self.byte_tracker.update_with_detections(sv.Detections(
+            xyxy=np.array([d["box"] for d in detections], dtype=np.float32),
+            confidence=np.array([d["confidence"] for d in detections], dtype=np.float32),
+            class_id=np.array([self.class_ids[d["label"]] for d in detections], dtype=int),
+        ))
+
+        # ByteTrack returns a filtered, reordered subset; match back one-to-one by IoU
+        if len(tracked) == 0:
+            return
+        boxes = np.array([d["box"] for d in detections], dtype=np.float32)
+        overlaps = box_iou(tracked.xyxy, boxes)
+        for _ in range(min(overlaps.shape)):
+            t, d = np.unravel_index(np.argmax(overlaps), overlaps.shape)
+            if overlaps[t, d] <= 0:
+                break
+            detections[d]["track_id"] = int(tracked.tracker_id[t])
+            overlaps[t, :] = -1
+            overlaps[:, d] = -1
+
+    def update(self, detections, timestamp=None):
+        """Feed one frame's detections and return the smoothed state."""
+        timestamp = time.time() if timestamp is None else timestamp
+        if self.last_timestamp is not None:
+            self._measure_rate(timestamp - self.last_timestamp)
+        self._track(detections)
+
+        dt = timestamp - self.last_timestamp if self.last_timestamp is not None else self.tau
+        self.last_timestamp = timestamp
+        weight = 1 - math.exp(-max(dt, 0) / self.tau) if self.tau > 0 else 1.0
+
+        frame_scores = {}
+        for detection in detections:
+            label = detection["label"]
+            frame_scores[label] = max(frame_scores.get(label, 0.0), detection["confidence"])
+
+        for label in set(self.scores) | set(frame_scores):
+            previous = self.scores.get(label, 0.0)
+            score = previous + weight * (frame_scores.get(label, 0.0) - previous)
+            if score < 0.01 and label != self.current:
+                self.scores.pop(label, None)
+            else:
+                self.scores[label] = score
+
+        best = max(self.scores, key=self.scores.get) if self.scores else None
+        current_score = self.scores.get(self.current, 0.0)
+        if self.current is not None and current_score < self.exit_threshold:
+            self.current = None
+        if best is not None and best != self.current and self.scores[best] >= self.enter_threshold:
+            if self.current is None or self.scores[best] >= current_score + self.switch_margin:
+                self.current = best
+                self.current_since = timestamp
+        if self.current is None:
+            self.current_since = None
+
+        current_detections = [d for d in detections if d["label"] == self.current]
+        if current_detections:
+            self.current_track_id = max(current_detections, key=lambda d: d["confidence"]).get("track_id")
+        elif self.current is None:
+            self.current_track_id = None
+
+        return self.state(timestamp)
+
+    def state(self, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        return {
+            "current_mudra": self.current,
+            "confidence": round(self.scores.get(self.current, 0.0), 4) if self.current else None,
+            "dwell_seconds": round(timestamp - self.current_since, 3) if self.current_since is not None else 0.0,
+            "track_id": self.current_track_id,
+            "smoothed": {label: round(score, 4) for label, score in self.scores.items()},
+        }
+
+
+class SessionTrackers:
+    """Per-session MudraTracker instances, expired after ``idle_ttl`` seconds."""
+
+    def __init__(self, idle_ttl=300, **tracker_options):
+        self.idle_ttl = idle_ttl
+        self.tracker_options = tracker_options
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def get(self, session_id):
+        now = time.time()
+        with self.lock:
+            expired = [key for key, (_, last_seen) in self.sessions.items() if now - last_seen > self.idle_ttl]
+            for key in expired:
+                del self.sessions[key]
+
+            tracker = self.sessions[session_id][0] if session_id in self.sessions else MudraTracker(**self.tracker_options)
+            self.sessions[session_id] = (tracker, now)
+            return tracker
+
+    def update(self, session_id, detections, timestamp=None):
+        tracker = self.get(session_id)
+        # A session's frames may be processed on different request threads; other sessions run in parallel
+        with tracker.lock:
+            return tracker.update(detections, timestamp)
@@ -189,8 +189,10 @@ export default function Dashboard() {
   }, [user]);
 
   useEffect(() => {
+    let cancelled = false;
+
     const fetchRoadmapData = async () => {
-      if (!user) return;
+      if (!user || cancelled) return;
 
       try {
         const userRef = doc(db, 'users', user.uid);
@@ -204,7 +206,7 @@ export default function Dashboard() {
           const completedDances = achievements.filter(a => a.category === 'performances').length;
           const completedPoses = achievements.filter(a => a.category === 'poses').length;
 
-          // Generate roadmap using Gemini API
+          // Generate roadmap (computed by the backend, text personalized by Gemini)
           const response = await fetch('http://localhost:5005/generate-roadmap', {
             method: 'POST',
             headers: {
@@ -214,21 +216,52 @@ export default function Dashboard() {
               completedMudras,
               completedDances,
               completedPoses,
-              totalScore: guruScore.current
+              totalScore: guruScore.current,
+              stream: true
             })
           });
 
-          const data = await response.json();
-          setRoadmapData(data.roadmap);
+          // NDJSON stream: the roadmap arrives at once, then each node as Gemini personalizes it
+          const reader = response.body.getReader();
+          const decoder = new TextDecoder();
+          let buffered = '';
+          while (true) {
+            const { done, value } = await reader.read();
+            if (cancelled) {
+              reader.cancel();
+              return;
+            }
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+            const lines = buffered.split('\n');
+            buffered = lines.pop();
+            for (const line of lines) {
+              if (!line.trim()) continue;
+              const event = JSON.parse(line);
+              if (event.type === 'roadmap') {
+                setRoadmapData(event.roadmap);
+                setIsLoading(false);
+              } else if (event.type === 'node') {
+                setRoadmapData(current => current && {
+                  ...current,
+                  nodes: current.nodes.map(node => node.id === event.node.id ? event.node : node)
+                });
+                setSelectedNode(current => current?.id === event.node.id ? event.node : current);
+              }
+            }
+          }
         }
       } catch (error) {
         console.error('Error fetching roadmap data:', error);
       } finally {
-        setIsLoading(false);
+        if (!cancelled) setIsLoading(false);
       }
     };
 
     fetchRoadmapData();
+    return () => {
+      cancelled = true;
+    };
   }, [user, guruScore.current]);
 
   const upcomingSessions = [
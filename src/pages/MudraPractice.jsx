@@ -159,23 +159,28 @@ export default function MudraPractice() {
     };
   }, []);
 
-  // Get mudra detections from Python backend
+  // Subscribe to mudra detections pushed by the Python backend
   useEffect(() => {
     if (isRecording) {
-      const interval = setInterval(async () => {
-        try {
-          const response = await fetch('http://127.0.0.1:5000/get_detections', {
-            method: 'GET',
-            headers: {
-              'Content-Type': 'application/json',
-              'Accept': 'application/json',
-            }
-          });
-          const data = await response.json();
-          
-          if (data.detections && data.detections.length > 0) {
-            const bestDetection = data.detections.sort((a, b) => b.confidence - a.confidence)[0];
-            
+      const source = new EventSource('http://127.0.0.1:5000/stream_detections');
+      let lastLabel = null;
+      let lastFeedbackAt = 0;
+      let stepTimeout = null;
+
+      source.addEventListener('detections', (event) => {
+        const data = JSON.parse(event.data);
+
+        // Prefer the server's smoothed, hysteresis-filtered mudra over the raw
+        // single-frame detections so one-frame spikes don't trigger transitions
+        const bestDetection = data.state
+          ? (data.state.current_mudra && { label: data.state.current_mudra, confidence: data.state.confidence })
+          : data.detections?.length > 0 && data.detections.reduce((best, d) => d.confidence > best.confidence ? d : best);
+
+        if (bestDetection) {
+          // Updates arrive at model frame rate, so only log a new feedback entry
+          // when the detected mudra changes or at most once per second
+          const now = Date.now();
+          if (bestDetection.label !== lastLabel || now - lastFeedbackAt >= 1000) {
             const newFeedback = {
               timestamp: new Date().toLocaleTimeString(),
               message: `Detected ${bestDetection.label} (${(bestDetection.confidence * 100).toFixed(1)}% confidence)`,
@@ -184,26 +189,35 @@ export default function MudraPractice() {
             };
             
             setFeedback(prev => [newFeedback, ...prev].slice(0, 5));
+            lastFeedbackAt = now;
+          }
+          if (bestDetection.label !== lastLabel) {
             setCurrentMudra(bestDetection.label);
+            lastLabel = bestDetection.label;
+          }
 
-            // Check if the detected mudra matches the current tutorial step
-            if (bestDetection.label === mudras[currentStep].name && bestDetection.confidence > 0.6) {
-              setIsCorrect(true);
-              // Wait for 2 seconds before moving to the next mudra
-              setTimeout(() => {
-                if (currentStep < mudras.length - 1) {
-                  setCurrentStep(prev => prev + 1);
-                  setIsCorrect(false);
-                }
-              }, 2000);
-            }
+          // Check if the detected mudra matches the current tutorial step
+          if (!stepTimeout && bestDetection.label === mudras[currentStep].name && bestDetection.confidence > 0.6) {
+            setIsCorrect(true);
+            // Wait for 2 seconds before moving to the next mudra
+            stepTimeout = setTimeout(() => {
+              if (currentStep < mudras.length - 1) {
+                setCurrentStep(prev => prev + 1);
+                setIsCorrect(false);
+              }
+            }, 2000);
           }
-        } catch (error) {
-          console.error('Error getting detections:', error);
         }
-      }, 1000);
+      });
+
+      source.onerror = (error) => {
+        // EventSource reconnects on its own; just log the interruption
+        console.error('Error getting detections:', error);
+      };
 
-      return () => clearInterval(interval);
+      return () => {
+        source.close();
+      };
     }
   }, [isRecording, currentStep]);
 
@@ -1,16 +1,21 @@
-from flask import Flask, Response
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import subprocess
 import os
 import sys
 import warnings
 
+from pose_engine import PoseScore, PoseScoringEngine
+
 # Suppress urllib3 warning
 warnings.filterwarnings('ignore', category=Warning)
 
 app = Flask(__name__)
 CORS(app)
 
+# Shared headless scorer for clients that send landmarks instead of video
+engine = PoseScoringEngine()
+
 @app.route('/')
 def index():
     try:
@@ -53,5 +58,35 @@ def index():
         </html>
         """
 
+@app.route('/score', methods=['POST'])
+def score():
+    """Score 33 pose landmarks ([x, y] or [x, y, z], normalized) against a reference pose"""
+    data = request.get_json(silent=True) or {}
+    landmarks = data.get('landmarks')
+    pose_name = data.get('pose', 'Araimandi')
+
+    if not isinstance(landmarks, list) or len(landmarks) != 33:
+        return jsonify({"error": "Expected 'landmarks' with 33 [x, y] points"}), 400
+    if pose_name not in engine.reference_angles:
+        return jsonify({"error": f"Unknown pose: {pose_name}"}), 400
+
+    try:
+        angles = engine.angles(landmarks)
+        top_k = int(data.get('top_k', 3))
+    except (TypeError, ValueError, IndexError) as e:
+        return jsonify({"error": f"Invalid request: {str(e)}"}), 400
+
+    reference = engine.reference_angles[pose_name]
+    if reference:
+        result = engine.score_angle_array(angles, reference, pose_name).to_dict()
+    else:
+        result = PoseScore(pose_name, "no_reference").to_dict()
+    # Also rank the whole reference library so clients can auto-detect the posture
+    result["detected"] = [
+        {"pose": name, "accuracy": accuracy}
+        for name, accuracy in engine.rank_poses(angles, k=top_k)
+    ]
+    return jsonify(result)
+
 if __name__ == '__main__':
     app.run(port=5010, debug=True) 
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Micro-benchmark of the joint-angle computation per frame.
+
+Compares the original approach (seven calculate_angle calls per frame, each
+building small arrays from landmark attributes) with the vectorized kernel
+on a single frame and on batches of frames. Uses random landmarks, so no
+camera or MediaPipe is needed.
+
+Usage:
+    python src/pose/benchmark_angles.py --frames 2000 --batch 256
+"""
+import argparse
+import timeit
+from collections import namedtuple
+
+import numpy as np
+
+from pose_angles import ANGLE_NAMES, calculate_angle, compute_angle_array, compute_angles, landmarks_to_array
+
+Landmark = namedtuple("Landmark", ["x", "y", "z"])
+
+
+def per_angle_calls(landmarks):
+    """The pre-vectorization implementation, kept here as the baseline."""
+    return {
+        'left_knee': calculate_angle(
+            [landmarks[23].x, landmarks[23].y], [landmarks[25].x, landmarks[25].y], [landmarks[27].x, landmarks[27].y]),
+        'right_knee': calculate_angle(
+            [landmarks[24].x, landmarks[24].y], [landmarks[26].x, landmarks[26].y], [landmarks[28].x, landmarks[28].y]),
+        'back': calculate_angle(
+            [landmarks[11].x, landmarks[11].y], [landmarks[23].x, landmarks[23].y], [landmarks[25].x, landmarks[25].y]),
+        'left_thigh': calculate_angle(
+            [landmarks[23].x, landmarks[23].y - 0.2], [landmarks[23].x, landmarks[23].y], [landmarks[25].x, landmarks[25].y]),
+        'right_thigh': calculate_angle(
+            [landmarks[24].x, landmarks[24].y - 0.2], [landmarks[24].x, landmarks[24].y], [landmarks[26].x, landmarks[26].y]),
+        'left_foot': calculate_angle(
+            [landmarks[27].x, landmarks[27].y], [landmarks[31].x, landmarks[31].y], [landmarks[29].x, landmarks[29].y]),
+        'right_foot': calculate_angle(
+            [landmarks[28].x, landmarks[28].y], [landmarks[32].x, landmarks[32].y], [landmarks[30].x, landmarks[30].y]),
+    }
+
+
+def per_frame_us(statement, frames, repeat):
+    best = min(timeit.repeat(statement, number=1, repeat=repeat))
+    return best / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    points = rng.random((args.frames, 33, 3))
+    landmark_frames = [[Landmark(*p) for p in frame] for frame in points]
+
+    # Both implementations must agree before their speed is worth comparing
+    for frame in landmark_frames[:100]:
+        expected = per_angle_calls(frame)
+        actual = compute_angles(frame)
+        assert all(abs(expected[name] - actual[name]) < 1e-9 for name in ANGLE_NAMES)
+
+    results = [
+        ("per-angle calls (before)", per_frame_us(
+            lambda: [per_angle_calls(frame) for frame in landmark_frames], args.frames, args.repeat)),
+        ("vectorized, one frame at a time", per_frame_us(
+            lambda: [compute_angles(frame) for frame in landmark_frames], args.frames, args.repeat)),
+        ("vectorized, landmarks already in an array", per_frame_us(
+            lambda: [compute_angle_array(frame) for frame in points], args.frames, args.repeat)),
+        (f"vectorized, batches of {args.batch}", per_frame_us(
+            lambda: [compute_angle_array(points[i:i + args.batch]) for i in range(0, args.frames, args.batch)],
+            args.frames, args.repeat)),
+        ("landmark objects -> array conversion only", per_frame_us(
+            lambda: [landmarks_to_array(frame) for frame in landmark_frames], args.frames, args.repeat)),
+    ]
+
+    baseline = results[0][1]
+    print(f"{'method':<44} {'us/frame':>9} {'speedup':>8}")
+    for name, us in results:
+        print(f"{name:<44} {us:>9.2f} {baseline / us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
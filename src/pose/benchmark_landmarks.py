@@ -0,0 +1,99 @@
+"""Compare landmark backends on a recorded clip: speed and angle agreement.
+
+Every backend processes the same mirrored RGB frames. Speed is reported as
+inference time per frame and FPS; agreement is the per-angle mean absolute
+difference (degrees) from the reference backend on frames where both found a
+pose, plus how often both rank the same reference pose first.
+
+Usage:
+    python src/pose/benchmark_landmarks.py public/1.mp4 --frames 300 \
+        --backends holistic pose:0 pose:1 pose:2
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from landmark_backends import create_backend
+from pose_angles import ANGLE_NAMES, REFERENCE_ANGLES, compute_angle_array, landmarks_to_array
+from pose_classifier import PoseClassifier
+
+
+def load_frames(path, count, size):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        # Same preprocessing as the live app
+        frame = cv2.flip(cv2.resize(frame, size), 1)
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    if not frames:
+        raise SystemExit(f"Could not read any frames from {path}")
+    return frames
+
+
+def run_backend(spec, frames):
+    """Return (per-frame inference ms, (N, 7) angles with NaN where no pose was found)."""
+    backend = create_backend(spec)
+    try:
+        # Warm up so model loading is not counted
+        backend.process(frames[0])
+        angles = np.full((len(frames), len(ANGLE_NAMES)), np.nan)
+        durations = []
+        for i, frame in enumerate(frames):
+            started = time.perf_counter()
+            results = backend.process(frame)
+            durations.append((time.perf_counter() - started) * 1000)
+            if results.pose_landmarks:
+                angles[i] = compute_angle_array(landmarks_to_array(results.pose_landmarks.landmark))
+        return np.array(durations), angles
+    finally:
+        backend.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--backends", nargs="+", default=["holistic", "pose:0", "pose:1", "pose:2"])
+    parser.add_argument("--reference", default=None, help="Backend the others are compared to (default: the first)")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames, (640, 480))
+    reference_spec = args.reference or args.backends[0]
+    specs = [reference_spec] + [spec for spec in args.backends if spec != reference_spec]
+    classifier = PoseClassifier(REFERENCE_ANGLES)
+
+    runs = {spec: run_backend(spec, frames) for spec in specs}
+    _, reference_angles = runs[reference_spec]
+    reference_found = ~np.isnan(reference_angles).any(axis=1)
+    reference_best = [classifier.rank(row, k=1)[:1] for row in reference_angles]
+
+    print(f"{len(frames)} frames, reference backend: {reference_spec}\n")
+    header = f"{'backend':<12} {'ms/frame':>9} {'p95 ms':>7} {'fps':>6} {'found':>6} {'same top pose':>14}"
+    print(header + "".join(f" {name:>11}" for name in ANGLE_NAMES))
+    for spec in specs:
+        durations, angles = runs[spec]
+        found = ~np.isnan(angles).any(axis=1)
+        both = found & reference_found
+        errors = np.abs(angles[both] - reference_angles[both]).mean(axis=0) if both.any() else \
+            np.full(len(ANGLE_NAMES), np.nan)
+        same_pose = [
+            bool(reference_best[i]) and classifier.rank(angles[i], k=1)[:1][0][0] == reference_best[i][0][0]
+            for i in np.flatnonzero(both)
+        ]
+        agreement = 100 * np.mean(same_pose) if same_pose else float("nan")
+
+        print(
+            f"{spec:<12} {durations.mean():>9.1f} {np.percentile(durations, 95):>7.1f} "
+            f"{1000 / durations.mean():>6.1f} {100 * found.mean():>5.0f}% {agreement:>13.0f}%"
+            + "".join(f" {error:>11.1f}" for error in errors)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Query latency of the BM25 Q&A index versus the original linear word-overlap scan.
+
+Builds a synthetic Q&A database of the requested sizes, asks paraphrased
+versions of stored questions (one word dropped, filler words added) and
+reports microseconds per query plus how often each method returns the
+question the query was derived from.
+
+Usage:
+    python src/pose/benchmark_qa.py --sizes 10 100 1000 5000 --queries 200
+"""
+import argparse
+import random
+import time
+
+from qa_index import QAIndex
+
+FILLER = ["please", "tell", "me", "about", "natya", "can", "you", "explain"]
+
+
+def linear_scan(qa_database, question):
+    """The original matcher from testy.py, kept here as the baseline."""
+    best_match = None
+    best_ratio = 0
+    for q in qa_database.keys():
+        q_words = set(q.split())
+        question_words = set(question.split())
+        common_words = q_words.intersection(question_words)
+        ratio = len(common_words) / max(len(q_words), len(question_words))
+        if ratio > best_ratio:
+            best_ratio = ratio
+            best_match = q
+    return best_match if best_ratio > 0.3 else None
+
+
+def make_database(size, rng):
+    vocabulary = [f"term{i}" for i in range(max(50, size // 2))]
+    database = {}
+    while len(database) < size:
+        words = ["what", "is"] + rng.sample(vocabulary, rng.randint(2, 5))
+        database[" ".join(words)] = f"answer {len(database)}"
+    return database
+
+
+def paraphrase(question, rng):
+    words = question.split()
+    words.pop(rng.randrange(2, len(words)))
+    return " ".join(rng.sample(FILLER, 2) + words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'entries':>8} {'build ms':>9} {'linear us':>10} {'index us':>9} {'speedup':>8} {'linear hit':>11} {'index hit':>10}")
+    for size in args.sizes:
+        database = make_database(size, rng)
+        targets = rng.choices(list(database), k=args.queries)
+        queries = [paraphrase(question, rng) for question in targets]
+
+        started = time.perf_counter()
+        index = QAIndex(database)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        linear = [linear_scan(database, query) for query in queries]
+        linear_us = (time.perf_counter() - started) / len(queries) * 1e6
+
+        started = time.perf_counter()
+        indexed = [index.best_match(query) for query in queries]
+        index_us = (time.perf_counter() - started) / len(queries) * 1e6
+
+        linear_hit = sum(match == target for match, target in zip(linear, targets)) / len(targets)
+        index_hit = sum(bool(match) and match[0] == target for match, target in zip(indexed, targets)) / len(targets)
+        print(
+            f"{size:>8} {build_ms:>9.1f} {linear_us:>10.1f} {index_us:>9.1f} {linear_us / index_us:>7.1f}x "
+            f"{100 * linear_hit:>10.0f}% {100 * index_hit:>9.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measure speech synthesis latency per TTS backend.
+
+Synthesizes the app's correction phrases with each backend and reports
+per-call latency (mean, p50, p95), then the latency of the same phrases
+served from an in-memory TTSCache. Backends that are not available here
+(no network for gtts, espeak-ng not installed) are reported and skipped,
+so "silent" and "tone" always run, e.g. in CI.
+
+Usage:
+    python src/pose/benchmark_tts.py --backends gtts espeak silent
+"""
+import argparse
+import tempfile
+import time
+
+from pose_engine import correction_phrases
+from tts_backends import TTS_BACKENDS, create_tts_backend
+from tts_cache import TTSCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=sorted(TTS_BACKENDS))
+    parser.add_argument("--phrases", type=int, default=8, help="Number of correction phrases to synthesize")
+    args = parser.parse_args()
+
+    phrases = correction_phrases()[:args.phrases]
+    print(f"{'backend':<8} {'format':>6} {'calls':>6} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'cached us':>10}")
+    for name in args.backends:
+        try:
+            backend = create_tts_backend(name)
+            with tempfile.TemporaryDirectory() as cache_dir:
+                cache = TTSCache(backend, cache_dir)
+                for text in phrases:
+                    cache.get(text)
+
+                started = time.perf_counter()
+                for text in phrases:
+                    cache.get(text)
+                cached_us = (time.perf_counter() - started) / len(phrases) * 1e6
+        except Exception as e:
+            print(f"{name:<8} skipped: {e}")
+            continue
+
+        stats = backend.stats()
+        print(
+            f"{name:<8} {backend.format:>6} {stats['calls']:>6} {stats['mean_ms']:>8.1f} "
+            f"{stats['p50_ms']:>7.1f} {stats['p95_ms']:>7.1f} {cached_us:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
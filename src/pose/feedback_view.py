@@ -0,0 +1,118 @@
+import time
+import tkinter as tk
+
+from pose_engine import ANGLE_GROUPS
+
+STATUS_LINES = {
+    "perfect": ("Status: 🟢 PERFECT!\n", ("green", "bold")),
+    "very_good": ("Status: 🟡 VERY GOOD\n", ("orange", "bold")),
+    "needs_adjustment": ("Status: 🔴 NEEDS ADJUSTMENT\n", ("red", "bold")),
+}
+
+
+class FeedbackView:
+    """Keeps the feedback Text widget in sync with the latest PoseScore, cheaply.
+
+    Tags are configured once. Each frame's score is turned into the values
+    shown on screen; the widget is only rewritten when a discrete value
+    changes (status, level, an angle crossing its tolerance, the corrections)
+    or a number moves by at least ``threshold``, and never more often than
+    ``max_rate`` times per second, independent of the inference rate. A
+    change held back by the rate limit is painted by a trailing flush
+    scheduled on the widget, so it shows up even if no further frames arrive.
+    """
+
+    def __init__(self, text_widget, max_rate=5.0, threshold=0.5):
+        self.text = text_widget
+        self.min_interval = 1.0 / max_rate if max_rate else 0.0
+        self.threshold = threshold
+        self.shown = None
+        self.pending = None
+        self.last_paint = 0.0
+        self.trailing = None
+        self.counts = {"frames": 0, "paints": 0}
+
+        self.text.tag_configure("green", foreground="green")
+        self.text.tag_configure("red", foreground="red")
+        self.text.tag_configure("orange", foreground="orange")
+        self.text.tag_configure("bold", font=("Arial", 11, "bold"))
+
+    def show_score(self, score, level):
+        """Queue a PoseScore for display; returns True if the widget was repainted."""
+        numbers = [score.overall_accuracy] + [result.current for result in score.angles.values()]
+        state = (
+            score.status,
+            level,
+            tuple((name, result.within_tolerance, result.target) for name, result in score.angles.items()),
+            tuple(score.corrections[:3]),
+        )
+        return self._update(state, numbers, lambda: self._score_segments(score, level))
+
+    def show_message(self, segments):
+        """Show fixed text, given as (text, tags) segments."""
+        segments = tuple(segments)
+        return self._update(segments, [], lambda: segments)
+
+    def _update(self, state, numbers, build):
+        self.counts["frames"] += 1
+        if self.shown is not None:
+            shown_state, shown_numbers = self.shown
+            if state == shown_state and all(
+                abs(new - old) < self.threshold for new, old in zip(numbers, shown_numbers)
+            ):
+                self.pending = None
+                return False
+
+        # Changed: paint now if the rate allows, otherwise keep the newest pending
+        self.pending = (state, numbers, build)
+        return self.flush()
+
+    def flush(self, force=False):
+        """Paint the pending update if the repaint interval has passed (or ``force``)."""
+        if self.pending is None:
+            return False
+        now = time.perf_counter()
+        if not force and now - self.last_paint < self.min_interval:
+            if self.trailing is None:
+                delay_ms = int((self.min_interval - (now - self.last_paint)) * 1000) + 1
+                self.trailing = self.text.after(delay_ms, self._trailing_flush)
+            return False
+
+        state, numbers, build = self.pending
+        self.pending = None
+        self.last_paint = now
+        self.shown = (state, numbers)
+        self.counts["paints"] += 1
+
+        self.text.delete(1.0, tk.END)
+        for text, tags in build():
+            self.text.insert(tk.END, text, tags)
+        return True
+
+    def _trailing_flush(self):
+        self.trailing = None
+        self.flush()
+
+    def _score_segments(self, score, level):
+        segments = [
+            STATUS_LINES[score.status],
+            (f"Accuracy: {score.overall_accuracy:.1f}%\n\n", "bold"),
+            (f"Current Level: {level}\n", "bold"),
+        ]
+        for group_name, angles in ANGLE_GROUPS.items():
+            segments.append((f"{group_name}:\n", "bold"))
+            for angle_name in angles:
+                result = score.angles[angle_name]
+                if result.within_tolerance:
+                    segments.append((f"✓ {result.label}: ", "green"))
+                else:
+                    segments.append((f"× {result.label}: ", "red"))
+                segments.append((f"{result.current:.1f}° (Target: {result.target:.1f}°)\n", ()))
+            segments.append(("\n", ()))
+
+        corrections = score.corrections
+        if corrections:
+            segments.append(("Adjustments Needed:\n", "bold"))
+            for suggestion in corrections[:3]:  # Show top 3 suggestions
+                segments.append((f"• {suggestion}\n", "red"))
+        return segments
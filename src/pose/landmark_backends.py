@@ -0,0 +1,110 @@
+import importlib
+
+import mediapipe as mp
+
+# What each built-in backend can detect; pose scoring only needs "pose"
+BACKEND_FEATURES = {
+    "holistic": {"pose", "face", "hands"},
+    "pose": {"pose"},
+}
+
+MODEL_COMPLEXITIES = (0, 1, 2)
+
+
+class HolisticBackend:
+    """MediaPipe Holistic: body pose plus face mesh and both hands."""
+
+    name = "holistic"
+    features = BACKEND_FEATURES["holistic"]
+
+    def __init__(self, model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.model_complexity = model_complexity
+        self.model = mp.solutions.holistic.Holistic(
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def process(self, image):
+        """Run on an RGB image; the result has ``pose_landmarks`` like every backend."""
+        return self.model.process(image)
+
+    def close(self):
+        self.model.close()
+
+
+class PoseBackend(HolisticBackend):
+    """MediaPipe Pose only, skipping face and hand inference.
+
+    ``model_complexity`` 0 (lite), 1 (full) or 2 (heavy) trades landmark
+    accuracy for speed.
+    """
+
+    name = "pose"
+    features = BACKEND_FEATURES["pose"]
+
+    def __init__(self, model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.model_complexity = model_complexity
+        self.model = mp.solutions.pose.Pose(
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+
+BACKENDS = {
+    "holistic": HolisticBackend,
+    "pose": PoseBackend,
+}
+
+
+def register_backend(name, factory):
+    """Add a plug-in backend.
+
+    ``factory(model_complexity=..., **kwargs)`` must return an object with
+    ``process(rgb_image)`` (result exposing ``pose_landmarks``), ``close()``
+    and a ``features`` set.
+    """
+    BACKENDS[name] = factory
+
+
+def select_backend(features):
+    """Name of the cheapest built-in backend that provides every feature in ``features``."""
+    features = set(features)
+    for name in ("pose", "holistic"):
+        if features <= BACKEND_FEATURES[name]:
+            return name
+    raise ValueError(f"No landmark backend provides {sorted(features)}")
+
+
+def create_backend(spec="auto", features=("pose",), **kwargs):
+    """Create a landmark backend from a spec string.
+
+    ``spec`` is ``auto`` (the cheapest backend for ``features``), a backend
+    name with an optional complexity such as ``pose:0`` or ``holistic``, or
+    ``module:attribute`` naming a plug-in factory to import.
+    """
+    spec = (spec or "auto").strip()
+    name, _, option = spec.partition(":")
+
+    if name == "auto":
+        name = select_backend(features)
+    elif name not in BACKENDS and option and not option.isdigit():
+        # Plug-in given as an importable "module:attribute"
+        factory = getattr(importlib.import_module(name), option)
+        return factory(**kwargs)
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown landmark backend '{name}', expected one of {sorted(BACKENDS)}")
+    if option:
+        complexity = int(option)
+        if complexity not in MODEL_COMPLEXITIES:
+            raise ValueError(f"model_complexity must be one of {MODEL_COMPLEXITIES}, got {complexity}")
+        kwargs["model_complexity"] = complexity
+
+    backend = BACKENDS[name](**kwargs)
+    missing = set(features) - set(backend.features)
+    if missing:
+        backend.close()
+        raise ValueError(f"Landmark backend '{name}' does not provide {sorted(missing)}")
+    return backend
@@ -0,0 +1,124 @@
+import numpy as np
+
+# Default reference angles (degrees) for each supported pose
+REFERENCE_ANGLES = {
+    'Araimandi': {
+        'left_knee': 99.2,
+        'right_knee': 114.3,
+        'back': 137.6,
+        'left_thigh': 136.0,
+        'right_thigh': 138.5,
+        'left_foot': 36.4,
+        'right_foot': 25.4,
+    },
+    'Muzhumandi': {
+        'left_knee': 177.7,
+        'right_knee': 80.6,
+        'back': 178.1,
+        'left_thigh': 6.3,
+        'right_thigh': 12.4,
+        'left_foot': 7.3,
+        'right_foot': 15.1,
+    },
+    'Samapadam': {
+        'left_knee': 176.1,
+        'right_knee': 176.1,
+        'back': 174.3,
+        'left_thigh': 177.2,
+        'right_thigh': 175.0,
+        'left_foot': 10.5,
+        'right_foot': 7.3,
+    }
+}
+
+# Angle tolerances - tighter 5 degree tolerance
+ANGLE_TOLERANCES = {
+    'left_knee': 5,
+    'right_knee': 5,
+    'back': 5,
+    'left_thigh': 5,
+    'right_thigh': 5,
+    'left_foot': 5,
+    'right_foot': 5
+}
+
+ANGLE_NAMES = list(ANGLE_TOLERANCES)
+
+
+def calculate_angle(a, b, c):
+    """Calculate the angle between three points."""
+    a = np.array(a)  # First point
+    b = np.array(b)  # Middle point
+    c = np.array(c)  # End point
+
+    radians = np.arctan2(c[1] - b[1], c[0] - b[0]) - np.arctan2(a[1] - b[1], a[0] - b[0])
+    angle = np.abs(radians * 180.0 / np.pi)
+
+    if angle > 180.0:
+        angle = 360 - angle
+
+    return angle
+
+
+# Virtual points appended after the 33 MediaPipe landmarks: each hip moved up
+# by THIGH_OFFSET, giving a vertical reference line for the thigh angles
+THIGH_OFFSET = 0.2
+LEFT_HIP_ABOVE = 33
+RIGHT_HIP_ABOVE = 34
+
+# (first, middle, end) landmark indices for each angle, in ANGLE_NAMES order
+ANGLE_TRIPLETS = np.array([
+    [23, 25, 27],                # left_knee: hip, knee, ankle
+    [24, 26, 28],                # right_knee
+    [11, 23, 25],                # back: shoulder, hip, knee
+    [LEFT_HIP_ABOVE, 23, 25],    # left_thigh: vertical above hip, hip, knee
+    [RIGHT_HIP_ABOVE, 24, 26],   # right_thigh
+    [27, 31, 29],                # left_foot: ankle, foot index, heel
+    [28, 32, 30],                # right_foot
+], dtype=np.intp)
+
+
+def landmarks_to_array(landmarks):
+    """Return an (33, 2) float array of x, y from MediaPipe landmarks or coordinates."""
+    if hasattr(landmarks[0], "x"):
+        # Two flat lists convert faster than 33 small tuples
+        return np.array([[lm.x for lm in landmarks], [lm.y for lm in landmarks]], dtype=np.float64).T
+    return np.asarray(landmarks, dtype=np.float64)[..., :2]
+
+
+def compute_angle_array(points):
+    """Compute all pose angles for one frame or a batch of frames in one pass.
+
+    ``points`` has shape (33, 2|3) or (N, 33, 2|3); only x and y are used.
+    Returns angles in degrees with shape (7,) or (N, 7), ordered as ANGLE_NAMES.
+    """
+    points = np.asarray(points, dtype=np.float64)[..., :2]
+    hips_above = points[..., [23, 24], :].copy()
+    hips_above[..., 1] -= THIGH_OFFSET
+    points = np.concatenate([points, hips_above], axis=-2)
+
+    a = points[..., ANGLE_TRIPLETS[:, 0], :]
+    b = points[..., ANGLE_TRIPLETS[:, 1], :]
+    c = points[..., ANGLE_TRIPLETS[:, 2], :]
+    radians = (
+        np.arctan2(c[..., 1] - b[..., 1], c[..., 0] - b[..., 0])
+        - np.arctan2(a[..., 1] - b[..., 1], a[..., 0] - b[..., 0])
+    )
+    angles = np.abs(np.degrees(radians))
+    return np.where(angles > 180.0, 360.0 - angles, angles)
+
+
+def compute_angles(landmarks):
+    """Calculate all pose angles from MediaPipe pose landmarks."""
+    return dict(zip(ANGLE_NAMES, compute_angle_array(landmarks_to_array(landmarks)).tolist()))
+
+
+def angle_accuracy_array(angles, reference_angles, tolerances=ANGLE_TOLERANCES):
+    """Accuracy percentage of each angle against its target.
+
+    ``angles`` is a (7,) or (N, 7) array in ANGLE_NAMES order; an angle off by
+    its full tolerance or more scores 0.
+    """
+    targets = np.array([reference_angles[name] for name in ANGLE_NAMES])
+    limits = np.array([tolerances[name] for name in ANGLE_NAMES])
+    return np.maximum(0, 100 - (np.abs(angles - targets) / limits) * 100)
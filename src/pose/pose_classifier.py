@@ -0,0 +1,94 @@
+import numpy as np
+
+from pose_angles import ANGLE_NAMES, ANGLE_TOLERANCES
+
+
+class PoseClassifier:
+    """Scores one frame's angles against every reference pose at once.
+
+    References are stacked into a (poses x angles) matrix, so ranking the
+    whole library is a single tolerance-weighted NumPy expression using the
+    same accuracy formula as the single-pose scorer. Once the library grows
+    past ``index_threshold`` poses, each angle column is kept sorted so the
+    poses within tolerance of the frame can be counted per angle with binary
+    searches. A pose within tolerance on only ``h`` angles scores at most
+    ``100 * h / angles`` (every other angle is clipped to 0%), so candidates
+    are scored from the most hits down until no remaining pose can beat the
+    k-th best. Results are always identical to scoring the whole library.
+    """
+
+    def __init__(self, reference_angles, tolerances=ANGLE_TOLERANCES, index_threshold=1000):
+        self.names = [name for name, angles in reference_angles.items() if angles]
+        self.tolerances = np.array([tolerances[name] for name in ANGLE_NAMES], dtype=np.float64)
+        self.matrix = np.array(
+            [[reference_angles[name][angle] for angle in ANGLE_NAMES] for name in self.names],
+            dtype=np.float64
+        ).reshape(len(self.names), len(ANGLE_NAMES))
+        # Angles in units of their tolerance, so deviations compare directly to 1
+        self.scaled = self.matrix / self.tolerances
+
+        self.sorted_rows = None
+        if len(self.names) > index_threshold:
+            self.sorted_rows = np.argsort(self.scaled, axis=0, kind="stable").T
+            self.sorted_columns = np.take_along_axis(self.scaled.T, self.sorted_rows, axis=1)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _accuracy(self, rows, scaled_angles):
+        # Same as max(0, 100 - |current - target| / tolerance * 100), averaged over angles
+        candidates = self.scaled if rows is None else self.scaled[rows]
+        deviation = np.abs(candidates - scaled_angles)
+        return 100 - 100 * np.minimum(deviation, 1).mean(axis=-1)
+
+    def _candidates(self, scaled_angles, k):
+        """Smallest set of rows guaranteed to contain the top k, or None to score everything."""
+        within = [
+            rows[np.searchsorted(column, value - 1, side="right"):np.searchsorted(column, value + 1, side="left")]
+            for rows, column, value in zip(self.sorted_rows, self.sorted_columns, scaled_angles)
+        ]
+        hits = np.bincount(np.concatenate(within), minlength=len(self.names))
+
+        count = len(ANGLE_NAMES)
+        for h in range(count, 0, -1):
+            rows = np.flatnonzero(hits >= h)
+            if len(rows) < k:
+                continue
+            # Rows left out have at most h - 1 angles within tolerance
+            kth = np.partition(self._accuracy(rows, scaled_angles), -k)[-k]
+            if kth > 100 * (h - 1) / count:
+                return rows
+        return None
+
+    def rank(self, angles, k=None):
+        """Return [(pose name, accuracy), ...] best first, for a (7,) angle array or dict.
+
+        ``k`` limits the result to the top k poses (required to benefit from
+        the index on large libraries).
+        """
+        if isinstance(angles, dict):
+            angles = [angles[name] for name in ANGLE_NAMES]
+        angles = np.asarray(angles, dtype=np.float64)
+        if not self.names or np.isnan(angles).any():
+            return []
+
+        scaled_angles = angles / self.tolerances
+        rows = None
+        if self.sorted_rows is not None and k is not None and k < len(self.names):
+            rows = self._candidates(scaled_angles, k)
+
+        scores = self._accuracy(rows, scaled_angles)
+        if k is not None and k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+            order = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+        names = self.names if rows is None else [self.names[row] for row in rows]
+        return [(names[i], float(scores[i])) for i in order]
+
+    def classify(self, angles, min_accuracy=50):
+        """Return the best matching (pose name, accuracy), or None if nothing is close enough."""
+        ranked = self.rank(angles, k=1)
+        if ranked and ranked[0][1] >= min_accuracy:
+            return ranked[0]
+        return None
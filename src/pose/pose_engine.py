@@ -0,0 +1,212 @@
+import copy
+
+import numpy as np
+
+from pose_angles import (
+    ANGLE_NAMES, ANGLE_TOLERANCES, REFERENCE_ANGLES, angle_accuracy_array, compute_angle_array, compute_angles,
+    landmarks_to_array
+)
+from pose_classifier import PoseClassifier
+
+# Angles grouped by body part, in the order feedback is shown
+ANGLE_GROUPS = {
+    "Legs": ["left_knee", "right_knee"],
+    "Back": ["back"],
+    "Thighs": ["left_thigh", "right_thigh"],
+    "Feet": ["left_foot", "right_foot"]
+}
+
+LEVEL_THRESHOLDS = {
+    "Beginner": 75,
+    "Intermediate": 85,
+    "Advanced": 92,
+    "Expert": 97
+}
+
+class AngleResult:
+    """Measured vs. target value of one joint angle."""
+
+    __slots__ = ("name", "current", "target", "tolerance", "accuracy")
+
+    def __init__(self, name, current, target, tolerance, accuracy):
+        self.name = name
+        self.current = current
+        self.target = target
+        self.tolerance = tolerance
+        self.accuracy = accuracy
+
+    @property
+    def label(self):
+        return self.name.replace('_', ' ').title()
+
+    @property
+    def within_tolerance(self):
+        return abs(self.current - self.target) <= self.tolerance
+
+    @property
+    def correction(self):
+        """Spoken/display correction, or None when the angle is within tolerance."""
+        if self.within_tolerance:
+            return None
+        if self.current > self.target:
+            return f"Reduce {self.label} angle"
+        return f"Increase {self.label} angle"
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "current": float(self.current),
+            "target": float(self.target),
+            "accuracy": float(self.accuracy),
+            "within_tolerance": self.within_tolerance,
+        }
+
+
+def correction_phrases(angle_names=ANGLE_NAMES):
+    """Every correction AngleResult can produce, e.g. to pre-synthesize voice feedback."""
+    return [
+        AngleResult(name, current, 0, 0, 0).correction
+        for name in angle_names
+        for current in (1, -1)
+    ]
+
+
+class PoseScore:
+    """Result of scoring one frame against a reference pose; contains no UI state."""
+
+    __slots__ = ("pose_name", "status", "overall_accuracy", "angles")
+
+    def __init__(self, pose_name, status, overall_accuracy=0.0, angles=None):
+        self.pose_name = pose_name
+        self.status = status
+        self.overall_accuracy = overall_accuracy
+        self.angles = angles or {}
+
+    @property
+    def corrections(self):
+        """Corrections for out-of-tolerance angles, in display order."""
+        return [
+            self.angles[name].correction
+            for names in ANGLE_GROUPS.values()
+            for name in names
+            if name in self.angles and not self.angles[name].within_tolerance
+        ]
+
+    def to_dict(self):
+        return {
+            "pose": self.pose_name,
+            "status": self.status,
+            "overall_accuracy": float(self.overall_accuracy),
+            "angles": {name: result.to_dict() for name, result in self.angles.items()},
+            "corrections": self.corrections,
+        }
+
+
+def accuracy_status(overall_accuracy):
+    if overall_accuracy > 95:
+        return "perfect"
+    if overall_accuracy > 90:
+        return "very_good"
+    return "needs_adjustment"
+
+
+class PoseScoringEngine:
+    """Scores pose landmarks against a library of reference poses.
+
+    Landmarks go in, a PoseScore comes out; the engine has no UI or camera
+    dependencies, so the Tk app, the HTTP service and offline tools share it
+    and it can run in worker processes.
+    """
+
+    def __init__(self, reference_angles=None, tolerances=None):
+        self.reference_angles = copy.deepcopy(reference_angles or REFERENCE_ANGLES)
+        self.tolerances = dict(tolerances or ANGLE_TOLERANCES)
+        self._classifier = None
+
+    @property
+    def pose_names(self):
+        return list(self.reference_angles)
+
+    @property
+    def classifier(self):
+        """PoseClassifier over the current library, rebuilt after references change."""
+        if self._classifier is None:
+            self._classifier = PoseClassifier(self.reference_angles, self.tolerances)
+        return self._classifier
+
+    def set_reference(self, pose_name, angles):
+        self.reference_angles[pose_name] = dict(angles)
+        self._classifier = None
+
+    def clear_reference(self, pose_name):
+        self.reference_angles[pose_name] = {}
+        self._classifier = None
+
+    def angles(self, landmarks):
+        """(7,) angle array for one frame of landmarks, in ANGLE_NAMES order."""
+        return compute_angle_array(landmarks_to_array(landmarks))
+
+    def rank_poses(self, angles, k=None):
+        """Rank every reference pose by accuracy for an angle array; best first."""
+        return self.classifier.rank(angles, k=k)
+
+    def capture_reference(self, landmarks, pose_name):
+        """Store the angles of ``landmarks`` as the reference for ``pose_name``."""
+        angles = compute_angles(landmarks)
+        self.set_reference(pose_name, angles)
+        return angles
+
+    def score(self, landmarks, pose_name=None, reference=None):
+        """Score landmarks against ``reference`` or the stored reference for ``pose_name``."""
+        if reference is None:
+            reference = self.reference_angles.get(pose_name)
+        if landmarks is None or len(landmarks) == 0:
+            return PoseScore(pose_name, "no_pose")
+        if not reference:
+            return PoseScore(pose_name, "no_reference")
+        return self.score_angle_array(self.angles(landmarks), reference, pose_name)
+
+    def score_angles(self, current_angles, reference, pose_name=None):
+        """Score an angle dict (as returned by compute_angles) against a reference."""
+        return self.score_angle_array(np.array([current_angles[name] for name in ANGLE_NAMES]), reference, pose_name)
+
+    def score_angle_array(self, angles, reference, pose_name=None):
+        """Score a (7,) angle array in ANGLE_NAMES order against a reference."""
+        accuracies = angle_accuracy_array(angles, reference, self.tolerances)
+        results = {
+            name: AngleResult(name, float(angles[i]), reference[name], self.tolerances[name], float(accuracies[i]))
+            for i, name in enumerate(ANGLE_NAMES)
+        }
+        overall = float(accuracies.mean())
+        return PoseScore(pose_name, accuracy_status(overall), overall, results)
+
+
+class ProgressTracker:
+    """Tracks recent accuracy and the dancer's level across frames."""
+
+    def __init__(self, history_size=10, min_readings=5, level_thresholds=None):
+        self.history_size = history_size
+        self.min_readings = min_readings
+        self.level_thresholds = dict(level_thresholds or LEVEL_THRESHOLDS)
+        self.performance_history = []
+        self.current_level = "Beginner"
+
+    def update(self, overall_accuracy):
+        """Record an accuracy reading; return the new level if it changed, else None."""
+        self.performance_history.append(overall_accuracy)
+        if len(self.performance_history) > self.history_size:
+            self.performance_history.pop(0)
+
+        if len(self.performance_history) < self.min_readings:
+            return None
+
+        avg_performance = sum(self.performance_history) / len(self.performance_history)
+        new_level = "Beginner"
+        for level, threshold in self.level_thresholds.items():
+            if avg_performance >= threshold:
+                new_level = level
+
+        if new_level != self.current_level:
+            self.current_level = new_level
+            return new_level
+        return None
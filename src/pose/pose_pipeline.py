@@ -0,0 +1,176 @@
+import queue
+import threading
+import time
+
+import cv2
+
+
+class LatestQueue:
+    """Bounded hand-off between stages that drops stale items instead of blocking.
+
+    ``put`` never waits: if the consumer has not taken the previous item yet,
+    that item is discarded, so a slow stage always works on the newest data.
+    """
+
+    def __init__(self, maxsize=1):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, item):
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class StageStats:
+    """Smoothed per-stage duration and rate, safe to update from several threads."""
+
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self.durations = {}
+        self.rates = {}
+        self.last_seen = {}
+
+    def record(self, stage, duration_ms):
+        now = time.perf_counter()
+        with self.lock:
+            previous = self.durations.get(stage)
+            self.durations[stage] = duration_ms if previous is None else (
+                previous + self.smoothing * (duration_ms - previous)
+            )
+            last = self.last_seen.get(stage)
+            if last is not None and now > last:
+                rate = 1.0 / (now - last)
+                previous_rate = self.rates.get(stage)
+                self.rates[stage] = rate if previous_rate is None else (
+                    previous_rate + self.smoothing * (rate - previous_rate)
+                )
+            self.last_seen[stage] = now
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                stage: {"ms": self.durations[stage], "fps": self.rates.get(stage, 0.0)}
+                for stage in self.durations
+            }
+
+
+class PipelineResult:
+    """A processed frame ready for the UI thread to display."""
+
+    __slots__ = ("index", "image", "results", "captured_at")
+
+    def __init__(self, index, image, results, captured_at):
+        self.index = index
+        self.image = image
+        self.results = results
+        self.captured_at = captured_at
+
+
+class PosePipeline:
+    """Runs camera capture and landmark inference on their own threads.
+
+    The capture thread reads, resizes and mirrors frames; the inference thread
+    converts the newest frame to RGB and runs ``process`` on it (for example
+    a landmark backend's ``process``). Stages are connected by single-slot
+    LatestQueues, so stale frames are dropped rather than queued, and the UI
+    thread only picks up the latest finished PipelineResult to render.
+    """
+
+    def __init__(self, video_capture, process, size=(640, 480), flip=True):
+        self.video_capture = video_capture
+        self.process = process
+        self.size = size
+        self.flip = flip
+        self.frames = LatestQueue()
+        self.stats = StageStats()
+        self.result = None
+        self.result_lock = threading.Lock()
+        # Frame indices keep increasing across start/stop so a caller's last seen index stays valid
+        self.frame_index = 0
+        self.running = False
+        self.threads = []
+
+    def start(self):
+        if self.running:
+            return
+        self.clear_result()
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._capture_loop, name="pose-capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="pose-inference", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=2)
+        self.threads = []
+        self.clear_result()
+
+    def clear_result(self):
+        with self.result_lock:
+            self.result = None
+
+    def _capture_loop(self):
+        while self.running:
+            started = time.perf_counter()
+            ret, frame = self.video_capture.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+
+            frame = cv2.resize(frame, self.size)
+            if self.flip:
+                # Flip the frame horizontally for a selfie-view display
+                frame = cv2.flip(frame, 1)
+            self.frame_index += 1
+            self.stats.record("capture", (time.perf_counter() - started) * 1000)
+            self.frames.put((self.frame_index, frame, time.time()))
+
+    def _inference_loop(self):
+        while self.running:
+            item = self.frames.get(timeout=0.1)
+            if item is None:
+                continue
+            index, frame, captured_at = item
+
+            started = time.perf_counter()
+            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            results = self.process(image)
+            self.stats.record("inference", (time.perf_counter() - started) * 1000)
+
+            with self.result_lock:
+                self.result = PipelineResult(index, image, results, captured_at)
+
+    def latest(self, after_index=0):
+        """Return the newest finished result if it is newer than ``after_index``."""
+        with self.result_lock:
+            if self.result is not None and self.result.index > after_index:
+                return self.result
+            return None
+
+    def status_text(self):
+        """One-line summary of per-stage timings and achieved FPS."""
+        stats = self.stats.snapshot()
+        parts = []
+        for stage in ("capture", "inference", "render", "feedback"):
+            if stage in stats:
+                parts.append(f"{stage} {stats[stage]['fps']:.0f} fps / {stats[stage]['ms']:.1f} ms")
+        return " | ".join(parts) + (f" | dropped {self.frames.dropped}" if parts else "")
@@ -0,0 +1,161 @@
+import csv
+import heapq
+import json
+import math
+import re
+from collections import Counter, defaultdict
+
+STOP_WORDS = {
+    "a", "an", "the", "is", "are", "am", "do", "does", "i", "me", "my", "to", "of", "in", "on", "and", "or",
+    "what", "which", "how", "please", "tell", "about", "can", "you", "this", "that", "it",
+}
+
+# Longest first; each needs a stem of at least three letters to remain
+SUFFIXES = ("ingly", "edly", "ing", "ed", "ly")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def stem(word):
+    """Reduce inflected forms to one stem, e.g. "classes"/"class" and "improving"/"improves"/"improve".
+
+    Three steps applied in order to every word: plurals ("sses" -> "ss",
+    "ies" -> "y", a single final "s" dropped), then one verb/adverb suffix,
+    then a final "e". Each step keeps at least three letters.
+    """
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        word = word[:-1]
+
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Lowercased, stemmed content words of ``text``."""
+    return [stem(word) for word in TOKEN_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def load_qa_file(path):
+    """Load question -> answer pairs from a .json, .jsonl or .csv file.
+
+    JSON may be an object mapping questions to answers or a list of
+    ``{"question": ..., "answer": ...}`` records; JSONL and CSV use those
+    two fields per line/row.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            records = [json.loads(line) for line in f if line.strip()]
+        elif path.endswith(".csv"):
+            records = list(csv.DictReader(f))
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                return {question.lower().strip(): answer for question, answer in data.items()}
+            records = data
+    return {record["question"].lower().strip(): record["answer"] for record in records}
+
+
+class QAIndex:
+    """BM25-ranked inverted index over the questions of a Q&A database.
+
+    Built once; a query only touches the postings of its own tokens, so the
+    cost grows with the number of matching questions rather than the size of
+    the database. Each match also gets a ``coverage`` in [0, 1]: the share of
+    the stored question's IDF weight that the query contains, which is
+    comparable across queries and suits a fixed acceptance threshold.
+
+    BM25 needs enough questions for its IDF statistics to mean something; up
+    to ``linear_threshold`` entries ``best_match`` uses a plain word-overlap
+    scan instead, which is both fast enough and more accurate at that size.
+    """
+
+    def __init__(self, qa_pairs, k1=1.2, b=0.75, linear_threshold=50):
+        self.k1 = k1
+        self.b = b
+        self.linear_threshold = linear_threshold
+        self.questions = list(qa_pairs)
+        self.answers = [qa_pairs[question] for question in self.questions]
+
+        postings = defaultdict(list)
+        self.lengths = []
+        for doc_id, question in enumerate(self.questions):
+            counts = Counter(tokenize(question))
+            self.lengths.append(sum(counts.values()))
+            for token, count in counts.items():
+                postings[token].append((doc_id, count))
+        self.postings = dict(postings)
+
+        count = len(self.questions)
+        self.average_length = sum(self.lengths) / count if count else 0.0
+        self.idf = {
+            token: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for token, docs in self.postings.items()
+        }
+        # Total IDF weight per question, the denominator of coverage
+        self.weights = [0.0] * count
+        for token, docs in self.postings.items():
+            for doc_id, _ in docs:
+                self.weights[doc_id] += self.idf[token]
+
+    def __len__(self):
+        return len(self.questions)
+
+    def search(self, query, k=3):
+        """Return up to ``k`` matches as (question, answer, bm25 score, coverage), best first."""
+        scores = defaultdict(float)
+        matched = defaultdict(float)
+        for token in set(tokenize(query)):
+            docs = self.postings.get(token)
+            if not docs:
+                continue
+            idf = self.idf[token]
+            for doc_id, count in docs:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / self.average_length)
+                scores[doc_id] += idf * count * (self.k1 + 1) / (count + norm)
+                matched[doc_id] += idf
+
+        # Ties go to the question the query covers more, then to the earlier entry
+        best = heapq.nlargest(k, scores, key=lambda doc_id: (
+            round(scores[doc_id], 9), matched[doc_id] / self.weights[doc_id] if self.weights[doc_id] else 0.0, -doc_id
+        ))
+        return [
+            (self.questions[doc_id], self.answers[doc_id], scores[doc_id],
+             matched[doc_id] / self.weights[doc_id] if self.weights[doc_id] else 0.0)
+            for doc_id in best
+        ]
+
+    def best_match(self, query, min_coverage=0.5):
+        """Return the best ranked match that covers enough of its question, else None."""
+        if len(self.questions) <= self.linear_threshold:
+            return self.scan(query)
+        for result in self.search(query, k=3):
+            if result[3] >= min_coverage:
+                return result
+        return None
+
+    def scan(self, query, min_ratio=0.3):
+        """Word-overlap match against every question, as (question, answer, ratio, ratio) or None.
+
+        The share of shared words relative to the longer of the two; the
+        first question with the highest ratio wins.
+        """
+        query_words = set(query.lower().split())
+        best_doc, best_ratio = None, 0.0
+        for doc_id, question in enumerate(self.questions):
+            question_words = set(question.split())
+            ratio = len(query_words & question_words) / max(len(question_words), len(query_words))
+            if ratio > best_ratio:
+                best_doc, best_ratio = doc_id, ratio
+        if best_doc is None or best_ratio <= min_ratio:
+            return None
+        return self.questions[best_doc], self.answers[best_doc], best_ratio, best_ratio
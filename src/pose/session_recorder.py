@@ -0,0 +1,154 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from pose_angles import ANGLE_NAMES, angle_accuracy_array, compute_angle_array
+
+LANDMARK_COUNT = 33
+
+# One fixed-size record per frame; a session file is a flat array of these
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("landmarks", "<f4", (LANDMARK_COUNT, 4)),  # x, y, z, visibility
+    ("angles", "<f4", (len(ANGLE_NAMES),)),
+    ("accuracy", "<f4"),
+    ("pose", "<i2"),  # index into the metadata "poses" list, -1 if none
+])
+
+
+def landmarks_to_record(landmarks):
+    """(33, 4) float32 array of x, y, z, visibility from MediaPipe pose landmarks."""
+    return np.array(
+        [[lm.x for lm in landmarks], [lm.y for lm in landmarks],
+         [lm.z for lm in landmarks], [lm.visibility for lm in landmarks]],
+        dtype=np.float32
+    ).T
+
+
+class SessionRecorder:
+    """Appends per-frame landmarks, angles and accuracy to a binary session log.
+
+    Frames are written into a preallocated chunk of ``chunk_frames``
+    records; full chunks go to a writer thread that appends them to
+    ``<name>.bin`` with a single ``tofile`` and returns the buffer for reuse,
+    so the frame loop only does one row assignment. ``<name>.json`` holds the
+    dtype, angle and pose names; ``load_session`` memory-maps the log.
+    """
+
+    def __init__(self, directory, name=None, chunk_frames=256, spare_chunks=2):
+        os.makedirs(directory, exist_ok=True)
+        name = name or time.strftime("session_%Y%m%d_%H%M%S")
+        self.path = os.path.join(directory, f"{name}.bin")
+        self.metadata_path = os.path.join(directory, f"{name}.json")
+        self.chunk_frames = chunk_frames
+        self.poses = []
+        self.frames = 0
+        self.started_at = time.time()
+
+        self.spare = queue.Queue()
+        for _ in range(spare_chunks):
+            self.spare.put(np.zeros(chunk_frames, dtype=RECORD_DTYPE))
+        self.buffer = np.zeros(chunk_frames, dtype=RECORD_DTYPE)
+        self.filled = 0
+
+        self.pending = queue.Queue()
+        self.file = open(self.path, "ab")
+        self.writer = threading.Thread(target=self._write_loop, name="session-writer", daemon=True)
+        self.writer.start()
+        self._write_metadata()
+
+    def record(self, timestamp, landmarks, angles, accuracy=np.nan, pose_name=None):
+        """Add one frame; ``landmarks`` is a (33, 4) array from landmarks_to_record."""
+        row = self.buffer[self.filled]
+        row["timestamp"] = timestamp
+        row["landmarks"] = landmarks
+        row["angles"] = angles
+        row["accuracy"] = accuracy
+        row["pose"] = self._pose_index(pose_name)
+        self.filled += 1
+        self.frames += 1
+        if self.filled == self.chunk_frames:
+            self._hand_off()
+
+    def _pose_index(self, pose_name):
+        if pose_name is None:
+            return -1
+        if pose_name not in self.poses:
+            self.poses.append(pose_name)
+        return self.poses.index(pose_name)
+
+    def _hand_off(self):
+        self.pending.put((self.buffer, self.filled))
+        try:
+            self.buffer = self.spare.get_nowait()
+        except queue.Empty:
+            # Writer is behind; allocate rather than stall the frame loop
+            self.buffer = np.zeros(self.chunk_frames, dtype=RECORD_DTYPE)
+        self.filled = 0
+
+    def _write_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            buffer, count = item
+            buffer[:count].tofile(self.file)
+            self.file.flush()
+            self.spare.put(buffer)
+
+    def _write_metadata(self):
+        metadata = {
+            "version": 1,
+            "dtype": RECORD_DTYPE.descr,
+            "angles": ANGLE_NAMES,
+            "poses": self.poses,
+            "started_at": self.started_at,
+            "frames": self.frames,
+        }
+        with open(self.metadata_path, "w") as f:
+            json.dump(metadata, f, indent=2)
+
+    def close(self):
+        """Write the partial chunk, stop the writer and update the metadata."""
+        if self.file.closed:
+            return
+        if self.filled:
+            self.pending.put((self.buffer, self.filled))
+            self.filled = 0
+        self.pending.put(None)
+        self.writer.join()
+        self.file.close()
+        self._write_metadata()
+
+
+def load_session(path):
+    """Memory-map a recorded session; returns (records, metadata).
+
+    ``path`` is the ``.bin`` log or its ``.json`` metadata. ``records`` is a
+    read-only structured array with the RECORD_DTYPE fields.
+    """
+    base = os.path.splitext(path)[0]
+    with open(f"{base}.json") as f:
+        metadata = json.load(f)
+    dtype = np.dtype([tuple(field) for field in metadata["dtype"]])
+    if os.path.getsize(f"{base}.bin") == 0:
+        return np.zeros(0, dtype=dtype), metadata
+    return np.memmap(f"{base}.bin", dtype=dtype, mode="r"), metadata
+
+
+def rescore_session(records, reference_angles, tolerances=None):
+    """Recompute angles from the stored landmarks and score them against new reference angles.
+
+    Returns (angles, per-angle accuracy, overall accuracy) arrays; frames
+    without a pose (NaN landmarks) get NaN.
+    """
+    angles = compute_angle_array(records["landmarks"][..., :2])
+    if tolerances is None:
+        accuracies = angle_accuracy_array(angles, reference_angles)
+    else:
+        accuracies = angle_accuracy_array(angles, reference_angles, tolerances)
+    return angles, accuracies, accuracies.mean(axis=-1)
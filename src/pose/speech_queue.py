@@ -0,0 +1,167 @@
+import heapq
+import io
+import itertools
+import threading
+import time
+
+# Lower value is spoken first
+PRIORITY_ANSWER = 0
+PRIORITY_LEVEL_UP = 1
+PRIORITY_CORRECTION = 2
+
+
+class Utterance:
+    """One queued message; ``expires_at`` is None for messages that never go stale."""
+
+    __slots__ = ("text", "priority", "queued_at", "expires_at", "cancelled")
+
+    def __init__(self, text, priority, queued_at, expires_at=None):
+        self.text = text
+        self.priority = priority
+        self.queued_at = queued_at
+        self.expires_at = expires_at
+        self.cancelled = False
+
+
+class MixerPlayer:
+    """Plays encoded audio bytes from memory with pygame's music mixer."""
+
+    def __init__(self, audio_format):
+        from pygame import mixer
+
+        self.mixer = mixer
+        self.audio_format = audio_format
+
+    def play(self, audio):
+        self.mixer.music.stop()
+        self.mixer.music.unload()
+        self.mixer.music.load(io.BytesIO(audio), self.audio_format)
+        self.mixer.music.play()
+
+    def is_busy(self):
+        return self.mixer.music.get_busy()
+
+    def stop(self):
+        self.mixer.music.stop()
+
+
+class SpeechScheduler:
+    """Single audio worker that speaks queued messages one at a time by priority.
+
+    Answers to questions go before level-ups, which go before pose
+    corrections. Queuing a message that is already pending or playing is a
+    no-op, only the newest correction is kept (it supersedes older pending
+    ones), and corrections older than their ``max_age`` are dropped instead
+    of being spoken late. The worker blocks on a condition while the queue
+    is empty and sleeps between end-of-playback checks rather than spinning.
+    """
+
+    def __init__(self, get_audio, player, poll_interval=0.05):
+        self.get_audio = get_audio
+        self.player = player
+        self.poll_interval = poll_interval
+        self.condition = threading.Condition()
+        self.heap = []
+        self.pending = {}
+        self.sequence = itertools.count()
+        self.current = None
+        self.running = False
+        self.thread = None
+        self.counts = {"spoken": 0, "coalesced": 0, "superseded": 0, "expired": 0, "failed": 0}
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="speech", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    @property
+    def speaking(self):
+        return self.current is not None
+
+    def say(self, text, priority=PRIORITY_ANSWER, max_age=None):
+        """Queue ``text``; return False if it was merged into an identical message."""
+        now = time.monotonic()
+        with self.condition:
+            existing = self.pending.get(text)
+            if existing is not None or text == self.current:
+                if existing is not None and priority < existing.priority:
+                    # Re-queue at the more urgent priority
+                    existing.cancelled = True
+                    self._push(Utterance(text, priority, existing.queued_at, existing.expires_at))
+                self.counts["coalesced"] += 1
+                return False
+
+            if priority == PRIORITY_CORRECTION:
+                for utterance in list(self.pending.values()):
+                    if utterance.priority == PRIORITY_CORRECTION:
+                        utterance.cancelled = True
+                        del self.pending[utterance.text]
+                        self.counts["superseded"] += 1
+
+            self._push(Utterance(text, priority, now, now + max_age if max_age is not None else None))
+            self.condition.notify()
+            return True
+
+    def _push(self, utterance):
+        self.pending[utterance.text] = utterance
+        heapq.heappush(self.heap, (utterance.priority, next(self.sequence), utterance))
+
+    def _next(self):
+        """Block until a live utterance is available; None once stopped."""
+        with self.condition:
+            while self.running:
+                while self.heap:
+                    _, _, utterance = heapq.heappop(self.heap)
+                    if utterance.cancelled:
+                        continue
+                    del self.pending[utterance.text]
+                    if utterance.expires_at is not None and time.monotonic() > utterance.expires_at:
+                        self.counts["expired"] += 1
+                        continue
+                    self.current = utterance.text
+                    return utterance
+                self.condition.wait()
+            return None
+
+    def _run(self):
+        while True:
+            utterance = self._next()
+            if utterance is None:
+                return
+            try:
+                audio = self.get_audio(utterance.text)
+                # Synthesis can be slow on a cache miss; recheck before playing stale feedback
+                if utterance.expires_at is not None and time.monotonic() > utterance.expires_at:
+                    self.counts["expired"] += 1
+                    continue
+                self.player.play(audio)
+                self._wait_for_playback()
+                self.counts["spoken"] += 1
+            except Exception as e:
+                self.counts["failed"] += 1
+                print(f"Text-to-speech error: {e}")
+            finally:
+                self.current = None
+
+    def _wait_for_playback(self):
+        with self.condition:
+            while self.running and self.player.is_busy():
+                # Sleeps between checks; stop() wakes it immediately
+                self.condition.wait(self.poll_interval)
+            if not self.running:
+                self.player.stop()
+
+    def stats(self):
+        with self.condition:
+            return dict(self.counts, pending=len(self.pending), speaking=self.current)
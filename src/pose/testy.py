@@ -3,14 +3,34 @@ import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
 import mediapipe as mp
-import numpy as np
-from gtts import gTTS
 import os
-import tempfile
 from pygame import mixer  # For playing audio
 import threading
 import speech_recognition as sr
 import re
+import time
+
+from landmark_backends import create_backend
+from feedback_view import FeedbackView
+from pose_engine import PoseScoringEngine, ProgressTracker, correction_phrases
+from pose_pipeline import PosePipeline
+from qa_index import QAIndex, load_qa_file
+from session_recorder import SessionRecorder, landmarks_to_record
+from speech_queue import PRIORITY_ANSWER, PRIORITY_CORRECTION, PRIORITY_LEVEL_UP, MixerPlayer, SpeechScheduler
+from tts_backends import create_tts_backend
+from tts_cache import DEFAULT_CACHE_DIR, TTSCache
+
+LEVEL_UP_MESSAGE = "Congratulations! You are now at {} level!"
+
+# Fixed spoken prompts, kept together so they can be pre-synthesized
+VOICE_PROMPTS = {
+    "wake_word": "Please start your question with the word Natya",
+    "no_speech": "I didn't hear anything. Please try again.",
+    "not_understood": "I couldn't understand what you said. Please try again.",
+    "error": "There was an error processing your question. Please try again.",
+    "no_pose": "I don't detect a clear pose at the moment. Please ensure you're in frame and maintaining the position.",
+    "no_answer": "I'm sorry, I don't have information about that. Please try asking another question about Bharatanatyam.",
+}
 
 class BharatanatyamPoseApp:
     def __init__(self, window):
@@ -26,55 +46,33 @@ class BharatanatyamPoseApp:
         # Initialize video capture
         self.video_capture = cv2.VideoCapture(0)
 
-        # Initialize Mediapipe
+        # Initialize Mediapipe. Scoring only uses body landmarks, so by default
+        # the Pose-only model runs instead of Holistic (no face or hand models);
+        # POSE_LANDMARK_BACKEND picks another, e.g. "pose:0" or "holistic"
         self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_holistic = mp.solutions.holistic
-        self.holistic = self.mp_holistic.Holistic(
+        self.mp_pose = mp.solutions.pose
+        self.landmarker = create_backend(
+            os.getenv("POSE_LANDMARK_BACKEND", "auto"),
+            features=("pose",),
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
 
-        # Initialize pose references dictionary
-        self.all_reference_angles = {
-            'Araimandi': {
-                'left_knee': 99.2,
-                'right_knee': 114.3,
-                'back': 137.6,
-                'left_thigh': 136.0,
-                'right_thigh': 138.5,
-                'left_foot': 36.4,
-                'right_foot': 25.4,
-            },
-            'Muzhumandi': {
-                'left_knee': 177.7,
-                'right_knee': 80.6,
-                'back': 178.1,
-                'left_thigh': 6.3,
-                'right_thigh': 12.4,
-                'left_foot': 7.3,
-                'right_foot': 15.1,
-            },
-            'Samapadam': {
-                'left_knee': 176.1,
-                'right_knee': 176.1,
-                'back': 174.3,
-                'left_thigh': 177.2,
-                'right_thigh': 175.0,
-                'left_foot': 10.5,
-                'right_foot': 7.3,
-            }
-        }
+        # Capture and landmark inference run on background threads; the Tk
+        # thread only renders the latest finished frame
+        self.is_running = False
+        self.pipeline = PosePipeline(self.video_capture, self.landmarker.process)
+        self.last_rendered_index = 0
+        self.last_stats_update = 0
 
-        # Add angle tolerances - tighter 5 degree tolerance
-        self.angle_tolerances = {
-            'left_knee': 5,
-            'right_knee': 5,
-            'back': 5,
-            'left_thigh': 5,
-            'right_thigh': 5,
-            'left_foot': 5,
-            'right_foot': 5
-        }
+        # Optional per-run log of landmarks, angles and accuracy (set POSE_RECORD_DIR to enable)
+        self.record_dir = os.getenv("POSE_RECORD_DIR")
+        self.recorder = None
+
+        # Headless scoring engine holding the pose references and angle tolerances
+        self.engine = PoseScoringEngine()
+        self.all_reference_angles = self.engine.reference_angles
+        self.angle_tolerances = self.engine.tolerances
 
         # Current selected pose
         self.current_pose = 'Araimandi'
@@ -194,6 +192,27 @@ class BharatanatyamPoseApp:
         )
         self.status_label.pack(fill=tk.X)
 
+        self.pipeline_label = ttk.Label(
+            self.status_section,
+            text="Pipeline: -",
+            padding="5"
+        )
+        self.pipeline_label.pack(fill=tk.X)
+
+        self.tts_label = ttk.Label(
+            self.status_section,
+            text="Voice cache: -",
+            padding="5"
+        )
+        self.tts_label.pack(fill=tk.X)
+
+        self.detected_pose_label = ttk.Label(
+            self.status_section,
+            text="Detected Pose: -",
+            padding="5"
+        )
+        self.detected_pose_label.pack(fill=tk.X)
+
         # Feedback section
         self.feedback_section = ttk.LabelFrame(self.controls_frame, text="Feedback", padding="5")
         self.feedback_section.pack(fill=tk.BOTH, expand=True)
@@ -214,6 +233,9 @@ class BharatanatyamPoseApp:
         self.feedback_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.feedback_scroll.config(command=self.feedback_text.yview)
 
+        # Repaints the feedback only when shown values change, at most POSE_FEEDBACK_HZ times a second
+        self.feedback_view = FeedbackView(self.feedback_text, max_rate=float(os.getenv("POSE_FEEDBACK_HZ", "5")))
+
         # Make the window resizable
         self.window.resizable(True, True)
 
@@ -225,23 +247,20 @@ class BharatanatyamPoseApp:
         # Initialize audio mixer
         mixer.init()
         
-        # Create a temporary directory for audio files
-        self.temp_dir = tempfile.mkdtemp()
-        self.is_speaking = False
+        # Speech engine: "gtts" (online), "espeak" (offline espeak-ng), "silent"/"tone"
+        # (no audio dependencies, for tests) or "auto". Synthesized speech is cached
+        # by (text, lang, tld) in memory and on disk
+        self.tts_backend = create_tts_backend(os.getenv("POSE_TTS_BACKEND", "gtts"))
+        self.tts_cache = TTSCache(self.tts_backend, os.getenv("POSE_TTS_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+        # One audio worker speaks queued messages by priority (answers, level-ups, corrections)
+        self.speech = SpeechScheduler(self.tts_cache.get, MixerPlayer(self.tts_backend.format))
+        self.speech.start()
         
-        # Dancer progress tracking
-        self.performance_history = []  # Store last 10 accuracy scores
-        self.current_level = "Beginner"
+        # Dancer progress tracking (last 10 accuracy scores and current level)
+        self.progress = ProgressTracker()
         self.last_voice_feedback = ""  # To avoid repetitive feedback
         self.feedback_cooldown = 0  # Cooldown counter for voice feedback
-        
-        # Add level thresholds
-        self.level_thresholds = {
-            "Beginner": 75,
-            "Intermediate": 85,
-            "Advanced": 92,
-            "Expert": 97
-        }
 
         # Initialize speech recognition
         self.recognizer = sr.Recognizer()
@@ -304,29 +323,51 @@ class BharatanatyamPoseApp:
             "which pose am i doing": "CURRENT_POSE_PLACEHOLDER",  # Will be replaced dynamically
         })
 
+        # Synthesize everything the app can say in the background, so feedback plays instantly
+        self.tts_cache.prewarm(self.known_phrases())
+
+        # Extra Q&A pairs from a .json/.jsonl/.csv file (answered on demand, not
+        # pre-synthesized), then a search index built once
+        if os.getenv("POSE_QA_FILE"):
+            self.qa_database.update(load_qa_file(os.getenv("POSE_QA_FILE")))
+        self.qa_index = QAIndex(self.qa_database)
+
+    def known_phrases(self):
+        """Every fixed phrase the app may speak: corrections, level-ups, prompts and answers"""
+        phrases = correction_phrases()
+        phrases += [LEVEL_UP_MESSAGE.format(level) for level in self.progress.level_thresholds]
+        phrases += list(VOICE_PROMPTS.values())
+        phrases += [answer for answer in self.qa_database.values() if answer != "CURRENT_POSE_PLACEHOLDER"]
+        phrases += [self.pose_answer(pose_name) for pose_name in self.pose_info_database]
+        return phrases
+
+    def pose_answer(self, pose_name):
+        """Spoken description of the given pose, or None if it is unknown"""
+        pose_info = self.pose_info_database.get(pose_name, {})
+        if not pose_info:
+            return None
+        return f"You are currently in {pose_name}. {pose_info['description']} {pose_info['tips']}"
+
     def start_detection(self):
+        if self.is_running:
+            return
         self.is_running = True
+        self.last_rendered_index = 0
+        if self.record_dir:
+            self.recorder = SessionRecorder(self.record_dir)
+        self.pipeline.start()
         self.status_label.config(text="Status: Running")
         self.update_frame()
 
     def stop_detection(self):
         self.is_running = False
+        self.pipeline.stop()
+        if self.recorder:
+            self.recorder.close()
+            print(f"Session saved to {self.recorder.path} ({self.recorder.frames} frames)")
+            self.recorder = None
         self.status_label.config(text="Status: Stopped")
 
-    def calculate_angle(self, a, b, c):
-        """Calculate the angle between three points."""
-        a = np.array(a)  # First point
-        b = np.array(b)  # Middle point
-        c = np.array(c)  # End point
-
-        radians = np.arctan2(c[1] - b[1], c[0] - b[0]) - np.arctan2(a[1] - b[1], a[0] - b[0])
-        angle = np.abs(radians * 180.0 / np.pi)
-
-        if angle > 180.0:
-            angle = 360 - angle
-
-        return angle
-
     def start_reference_capture(self):
         """Start capturing reference pose"""
         self.ref_status_label.config(text="Hold the correct pose and wait 3 seconds...")
@@ -350,54 +391,22 @@ class BharatanatyamPoseApp:
 
     def capture_reference_pose(self):
         """Capture the current pose as reference and log all angles"""
-        ret, frame = self.video_capture.read()
+        if self.is_running:
+            # The pipeline threads own the camera and landmark model while running
+            latest = self.pipeline.latest()
+            ret, results = latest is not None, latest.results if latest else None
+        else:
+            ret, frame = self.video_capture.read()
+            if ret:
+                frame = cv2.flip(frame, 1)
+                image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                results = self.landmarker.process(image)
         if ret:
-            frame = cv2.flip(frame, 1)
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.holistic.process(image)
-            
             if results.pose_landmarks:
                 landmarks = results.pose_landmarks.landmark
-                new_reference = {
-                    'left_knee': self.calculate_angle(
-                        [landmarks[23].x, landmarks[23].y],
-                        [landmarks[25].x, landmarks[25].y],
-                        [landmarks[27].x, landmarks[27].y]
-                    ),
-                    'right_knee': self.calculate_angle(
-                        [landmarks[24].x, landmarks[24].y],
-                        [landmarks[26].x, landmarks[26].y],
-                        [landmarks[28].x, landmarks[28].y]
-                    ),
-                    'back': self.calculate_angle(
-                        [landmarks[11].x, landmarks[11].y],
-                        [landmarks[23].x, landmarks[23].y],
-                        [landmarks[25].x, landmarks[25].y]
-                    ),
-                    'left_thigh': self.calculate_angle(
-                        [landmarks[23].x, landmarks[23].y - 0.2],
-                        [landmarks[23].x, landmarks[23].y],
-                        [landmarks[25].x, landmarks[25].y]
-                    ),
-                    'right_thigh': self.calculate_angle(
-                        [landmarks[24].x, landmarks[24].y - 0.2],
-                        [landmarks[24].x, landmarks[24].y],
-                        [landmarks[26].x, landmarks[26].y]
-                    ),
-                    'left_foot': self.calculate_angle(
-                        [landmarks[27].x, landmarks[27].y],
-                        [landmarks[31].x, landmarks[31].y],
-                        [landmarks[29].x, landmarks[29].y]
-                    ),
-                    'right_foot': self.calculate_angle(
-                        [landmarks[28].x, landmarks[28].y],
-                        [landmarks[32].x, landmarks[32].y],
-                        [landmarks[30].x, landmarks[30].y]
-                    )
-                }
                 
                 # Store the reference angles for the current pose
-                self.all_reference_angles[self.current_pose] = new_reference
+                new_reference = self.engine.capture_reference(landmarks, self.current_pose)
                 self.reference_angles = new_reference
                 
                 # Log all angles in a formatted way
@@ -419,7 +428,7 @@ class BharatanatyamPoseApp:
 
     def clear_reference(self):
         """Clear the stored reference pose"""
-        self.all_reference_angles[self.current_pose] = {}
+        self.engine.clear_reference(self.current_pose)
         self.reference_angles = None
         self.ref_status_label.config(
             text=f"Reference Pose: Not set for {self.current_pose}"
@@ -430,86 +439,33 @@ class BharatanatyamPoseApp:
         if not landmarks:
             return "No pose detected"
 
+        # Compute all angles once, then rank every reference pose to auto-detect the posture
+        angles = self.engine.angles(landmarks)
+        self.show_detected_pose(self.engine.rank_poses(angles, k=3))
+
         # If no reference angles are set for current pose, show message and return
         if not self.reference_angles:
-            self.feedback_text.delete(1.0, tk.END)
-            self.feedback_text.tag_configure("bold", font=("Arial", 11, "bold"))
-            self.feedback_text.tag_configure("orange", foreground="orange")
-            self.feedback_text.insert(tk.END, "Status: ⚠️ NO REFERENCE\n", ("orange", "bold"))
-            self.feedback_text.insert(tk.END, f"\nPlease capture a reference pose for {self.current_pose} first.\n")
-            self.feedback_text.insert(tk.END, "\nUse the 'Capture Reference Pose' button while demonstrating the correct pose.")
+            if self.recorder:
+                self.recorder.record(time.time(), landmarks_to_record(landmarks), angles)
+            self.feedback_view.show_message([
+                ("Status: ⚠️ NO REFERENCE\n", ("orange", "bold")),
+                (f"\nPlease capture a reference pose for {self.current_pose} first.\n", ()),
+                ("\nUse the 'Capture Reference Pose' button while demonstrating the correct pose.", ()),
+            ])
             return "No reference angles set"
 
-        current_angles = {
-            'left_knee': self.calculate_angle(
-                [landmarks[23].x, landmarks[23].y],
-                [landmarks[25].x, landmarks[25].y],
-                [landmarks[27].x, landmarks[27].y]
-            ),
-            'right_knee': self.calculate_angle(
-                [landmarks[24].x, landmarks[24].y],
-                [landmarks[26].x, landmarks[26].y],
-                [landmarks[28].x, landmarks[28].y]
-            ),
-            'back': self.calculate_angle(
-                [landmarks[11].x, landmarks[11].y],
-                [landmarks[23].x, landmarks[23].y],
-                [landmarks[25].x, landmarks[25].y]
-            ),
-            'left_thigh': self.calculate_angle(
-                [landmarks[23].x, landmarks[23].y - 0.2],
-                [landmarks[23].x, landmarks[23].y],
-                [landmarks[25].x, landmarks[25].y]
-            ),
-            'right_thigh': self.calculate_angle(
-                [landmarks[24].x, landmarks[24].y - 0.2],
-                [landmarks[24].x, landmarks[24].y],
-                [landmarks[26].x, landmarks[26].y]
-            ),
-            'left_foot': self.calculate_angle(
-                [landmarks[27].x, landmarks[27].y],
-                [landmarks[31].x, landmarks[31].y],
-                [landmarks[29].x, landmarks[29].y]
-            ),
-            'right_foot': self.calculate_angle(
-                [landmarks[28].x, landmarks[28].y],
-                [landmarks[32].x, landmarks[32].y],
-                [landmarks[30].x, landmarks[30].y]
+        score = self.engine.score_angle_array(angles, self.reference_angles, self.current_pose)
+        self.overall_accuracy = score.overall_accuracy
+        feedback = score.corrections
+        if self.recorder:
+            self.recorder.record(
+                time.time(), landmarks_to_record(landmarks), angles, self.overall_accuracy, self.current_pose
             )
-        }
-
-        feedback = []
-        accuracy_scores = []
 
-        # Check each angle and provide specific feedback
-        for angle_name, current_angle in current_angles.items():
-            target_angle = self.reference_angles[angle_name]
-            tolerance = self.angle_tolerances[angle_name]
-            difference = abs(current_angle - target_angle)
-            
-            # Calculate accuracy percentage
-            accuracy = max(0, 100 - (difference / tolerance) * 100)
-            accuracy_scores.append(accuracy)
-
-        # Calculate overall pose accuracy
-        self.overall_accuracy = sum(accuracy_scores) / len(accuracy_scores)
-
-        # Update performance history
-        self.performance_history.append(self.overall_accuracy)
-        if len(self.performance_history) > 10:
-            self.performance_history.pop(0)
-        
         # Update dancer level based on recent performance
-        if len(self.performance_history) >= 5:  # Need at least 5 readings
-            avg_performance = sum(self.performance_history) / len(self.performance_history)
-            new_level = "Beginner"
-            for level, threshold in self.level_thresholds.items():
-                if avg_performance >= threshold:
-                    new_level = level
-            
-            if new_level != self.current_level:
-                self.current_level = new_level
-                self.speak(f"Congratulations! You are now at {new_level} level!")
+        new_level = self.progress.update(self.overall_accuracy)
+        if new_level:
+            self.speak(LEVEL_UP_MESSAGE.format(new_level), priority=PRIORITY_LEVEL_UP)
 
         # Update current pose status based on accuracy
         if self.overall_accuracy > 85:  # Only set current pose if accuracy is good
@@ -517,69 +473,17 @@ class BharatanatyamPoseApp:
         else:
             self.current_pose = None
 
-        # Create feedback message with color tags
-        self.feedback_text.delete(1.0, tk.END)
-        
-        # Configure text colors
-        self.feedback_text.tag_configure("green", foreground="green")
-        self.feedback_text.tag_configure("red", foreground="red")
-        self.feedback_text.tag_configure("orange", foreground="orange")
-        self.feedback_text.tag_configure("bold", font=("Arial", 11, "bold"))
-
-        # Add status header
-        if self.overall_accuracy > 95:
-            self.feedback_text.insert(tk.END, "Status: 🟢 PERFECT!\n", ("green", "bold"))
-        elif self.overall_accuracy > 90:
-            self.feedback_text.insert(tk.END, "Status: 🟡 VERY GOOD\n", ("orange", "bold"))
-        else:
-            self.feedback_text.insert(tk.END, "Status: 🔴 NEEDS ADJUSTMENT\n", ("red", "bold"))
-        
-        self.feedback_text.insert(tk.END, f"Accuracy: {self.overall_accuracy:.1f}%\n\n", "bold")
-
-        # Add level information to feedback
-        self.feedback_text.insert(tk.END, f"Current Level: {self.current_level}\n", "bold")
-
-        # Group angles by category
-        angle_groups = {
-            "Legs": ["left_knee", "right_knee"],
-            "Back": ["back"],
-            "Thighs": ["left_thigh", "right_thigh"],
-            "Feet": ["left_foot", "right_foot"]
-        }
-
-        # Add angle comparisons by group
-        for group_name, angles in angle_groups.items():
-            self.feedback_text.insert(tk.END, f"{group_name}:\n", "bold")
-            for angle_name in angles:
-                current = current_angles[angle_name]
-                target = self.reference_angles[angle_name]
-                diff = abs(current - target)
-                
-                name = angle_name.replace('_', ' ').title()
-                if diff <= self.angle_tolerances[angle_name]:
-                    self.feedback_text.insert(tk.END, f"✓ {name}: ", "green")
-                    self.feedback_text.insert(tk.END, f"{current:.1f}° (Target: {target:.1f}°)\n")
-                else:
-                    self.feedback_text.insert(tk.END, f"× {name}: ", "red")
-                    self.feedback_text.insert(tk.END, f"{current:.1f}° (Target: {target:.1f}°)\n")
-                    if current > target:
-                        feedback.append(f"Reduce {name} angle")
-                    else:
-                        feedback.append(f"Increase {name} angle")
-            
-            self.feedback_text.insert(tk.END, "\n")
-
-        # Add suggestions if needed
-        if feedback:
-            self.feedback_text.insert(tk.END, "Adjustments Needed:\n", "bold")
-            for suggestion in feedback[:3]:  # Show top 3 suggestions
-                self.feedback_text.insert(tk.END, f"• {suggestion}\n", "red")
+        # Update the feedback panel; usually a no-op as values rarely change visibly between frames
+        update_started = time.perf_counter()
+        self.feedback_view.show_score(score, self.progress.current_level)
+        self.pipeline.stats.record("feedback", (time.perf_counter() - update_started) * 1000)
 
         # Voice feedback for improvements
         if feedback and self.feedback_cooldown <= 0:
             voice_feedback = feedback[0]  # Get the most important feedback
             if voice_feedback != self.last_voice_feedback:
-                self.speak(voice_feedback)
+                # Corrections go stale quickly; drop them if not spoken within 3 seconds
+                self.speak(voice_feedback, priority=PRIORITY_CORRECTION, max_age=3)
                 self.last_voice_feedback = voice_feedback
                 self.feedback_cooldown = 50  # Set cooldown to avoid too frequent feedback
         
@@ -588,100 +492,71 @@ class BharatanatyamPoseApp:
 
         return "Pose check complete"
 
-    def speak(self, text):
-        """Speak the given text using Google Text-to-Speech"""
-        if self.is_speaking:  # Don't interrupt if already speaking
-            return
-            
-        def speak_thread():
-            temp_file = None
-            try:
-                self.is_speaking = True
-                
-                # Generate unique temporary filename
-                temp_file = os.path.join(self.temp_dir, f'speech_{threading.get_ident()}.mp3')
-                
-                # Generate speech
-                tts = gTTS(text=text, lang='en', tld='co.in')  # Using Indian English
-                
-                # Save to temporary file
-                tts.save(temp_file)
-                
-                # Stop any currently playing audio
-                mixer.music.stop()
-                mixer.music.unload()
-                
-                # Play the speech
-                mixer.music.load(temp_file)
-                mixer.music.play()
-                
-                # Wait for audio to finish
-                while mixer.music.get_busy():
-                    continue
-                    
-            except Exception as e:
-                print(f"Text-to-speech error: {e}")
-            finally:
-                # Clean up
-                self.is_speaking = False
-                if temp_file and os.path.exists(temp_file):
-                    try:
-                        mixer.music.unload()
-                        os.remove(temp_file)
-                    except Exception as e:
-                        print(f"Cleanup error: {e}")
-
-        # Run speech in separate thread to avoid blocking the GUI
-        threading.Thread(target=speak_thread, daemon=True).start()
+    def show_detected_pose(self, ranked):
+        """Show the best matching reference poses, only touching the label when the text changes"""
+        if ranked and ranked[0][1] > 0:
+            text = "Detected Pose: " + ", ".join(
+                f"{name} ({accuracy:.0f}%)" for name, accuracy in ranked if accuracy > 0
+            )
+        else:
+            text = "Detected Pose: -"
+        if text != self.detected_pose_label.cget("text"):
+            self.detected_pose_label.config(text=text)
+
+    def speak(self, text, priority=PRIORITY_ANSWER, max_age=None):
+        """Queue text for the audio worker; identical pending messages are merged"""
+        self.speech.say(text, priority, max_age)
 
     def update_frame(self):
         if self.is_running:
-            ret, frame = self.video_capture.read()
-            if ret:
-                # Resize frame to maintain reasonable size
-                frame = cv2.resize(frame, (640, 480))
+            result = self.pipeline.latest(self.last_rendered_index)
+            if result is not None:
+                render_started = time.perf_counter()
+                self.last_rendered_index = result.index
 
-                # Flip the frame horizontally for a selfie-view display
-                frame = cv2.flip(frame, 1)
-
-                # Recolor feed
-                image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                # Make detections
-                results = self.holistic.process(image)
-
-                # Recolor image back to BGR for rendering
-                image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+                # Frames come back from the pipeline already resized, mirrored and in RGB
+                image = result.image
+                results = result.results
 
-                # Draw pose landmarks with color based on accuracy
+                # Draw pose landmarks with color based on accuracy (RGB colors)
                 if results.pose_landmarks:
                     self.check_bharatanatyam_pose(results.pose_landmarks.landmark)
                     
                     self.mp_drawing.draw_landmarks(
                         image, 
                         results.pose_landmarks, 
-                        self.mp_holistic.POSE_CONNECTIONS,
+                        self.mp_pose.POSE_CONNECTIONS,
                         self.mp_drawing.DrawingSpec(
-                            color=(0,255,0) if self.overall_accuracy > 95 else (0,165,255) if self.overall_accuracy > 90 else (0,0,255),
+                            color=(0,255,0) if self.overall_accuracy > 95 else (255,165,0) if self.overall_accuracy > 90 else (255,0,0),
                             thickness=2, 
                             circle_radius=4
                         ),
                         self.mp_drawing.DrawingSpec(
-                            color=(0,255,0) if self.overall_accuracy > 95 else (0,165,255) if self.overall_accuracy > 90 else (0,0,255),
+                            color=(0,255,0) if self.overall_accuracy > 95 else (255,165,0) if self.overall_accuracy > 90 else (255,0,0),
                             thickness=2, 
                             circle_radius=2
                         )
                     )
 
-                # Convert frame to RGB for tkinter
-                frame_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-
                 # Convert to PhotoImage
-                image = Image.fromarray(frame_rgb)
-                photo = ImageTk.PhotoImage(image=image)
+                photo = ImageTk.PhotoImage(image=Image.fromarray(image))
 
                 self.video_label.config(image=photo)
                 self.video_label.image = photo
+                self.pipeline.stats.record("render", (time.perf_counter() - render_started) * 1000)
+
+            # Refresh the timing readout twice a second
+            now = time.perf_counter()
+            if now - self.last_stats_update >= 0.5:
+                self.last_stats_update = now
+                self.pipeline_label.config(text=f"Pipeline: {self.pipeline.status_text()}")
+                tts_stats = self.tts_cache.stats()
+                synthesis = tts_stats["synthesis"]
+                self.tts_label.config(
+                    text=f"Voice cache: {tts_stats['memory_hits'] + tts_stats['disk_hits']} hits / "
+                         f"{tts_stats['misses']} misses ({tts_stats['disk_items']} clips)"
+                         + (f" | {synthesis['backend']} {synthesis['p50_ms']:.0f} ms" if synthesis["calls"] else "")
+                )
 
             self.window.after(10, self.update_frame)
 
@@ -708,15 +583,15 @@ class BharatanatyamPoseApp:
                     question = text.replace("natya", "").strip()
                     self.answer_question(question)
                 else:
-                    self.speak("Please start your question with the word Natya")
+                    self.speak(VOICE_PROMPTS["wake_word"])
                 
             except sr.WaitTimeoutError:
-                self.speak("I didn't hear anything. Please try again.")
+                self.speak(VOICE_PROMPTS["no_speech"])
             except sr.UnknownValueError:
-                self.speak("I couldn't understand what you said. Please try again.")
+                self.speak(VOICE_PROMPTS["not_understood"])
             except Exception as e:
                 print(f"Voice recognition error: {e}")
-                self.speak("There was an error processing your question. Please try again.")
+                self.speak(VOICE_PROMPTS["error"])
             finally:
                 self.is_listening = False
                 self.voice_command_button.config(text="🎤 Ask Question")
@@ -731,10 +606,8 @@ class BharatanatyamPoseApp:
         # Check if asking about current pose
         if any(phrase in question for phrase in ["what pose", "what position", "which pose"]):
             if hasattr(self, 'current_pose'):
-                pose_info = self.pose_info_database.get(self.current_pose, {})
-                if pose_info:
-                    answer = (f"You are currently in {self.current_pose}. {pose_info['description']} "
-                            f"{pose_info['tips']}")
+                answer = self.pose_answer(self.current_pose)
+                if answer:
                     self.speak(answer)
                     
                     # Log the interaction
@@ -743,56 +616,41 @@ class BharatanatyamPoseApp:
                     self.feedback_text.insert(tk.END, f"Answer: {answer}\n")
                     return
             
-            self.speak("I don't detect a clear pose at the moment. Please ensure you're in frame and maintaining the position.")
+            self.speak(VOICE_PROMPTS["no_pose"])
             return
 
-        # Continue with existing question matching logic
-        best_match = None
-        best_ratio = 0
-        
-        for q in self.qa_database.keys():
-            # Simple word matching
-            q_words = set(q.split())
-            question_words = set(question.split())
-            common_words = q_words.intersection(question_words)
-            ratio = len(common_words) / max(len(q_words), len(question_words))
-            
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match = q
+        # Look the question up in the BM25 index of the Q&A database
+        match = self.qa_index.best_match(question)
 
         # If we found a good match
-        if best_ratio > 0.3:
-            answer = self.qa_database[best_match]
+        if match:
+            answer = match[1]
             # Replace placeholder if it's a pose question
             if answer == "CURRENT_POSE_PLACEHOLDER":
                 if hasattr(self, 'current_pose'):
-                    pose_info = self.pose_info_database.get(self.current_pose, {})
-                    if pose_info:
-                        answer = (f"You are currently in {self.current_pose}. {pose_info['description']} "
-                                f"{pose_info['tips']}")
+                    answer = self.pose_answer(self.current_pose) or answer
                 else:
-                    answer = "I don't detect a clear pose at the moment. Please ensure you're in frame and maintaining the position."
+                    answer = VOICE_PROMPTS["no_pose"]
             self.speak(answer)
         else:
-            self.speak("I'm sorry, I don't have information about that. Please try asking another question about Bharatanatyam.")
+            self.speak(VOICE_PROMPTS["no_answer"])
 
         # Log the interaction
         self.feedback_text.insert(tk.END, "\nQ&A Interaction:\n", "bold")
         self.feedback_text.insert(tk.END, f"Question: {question}\n")
-        self.feedback_text.insert(tk.END, f"Answer: {answer if best_ratio > 0.3 else 'No matching answer found'}\n")
+        self.feedback_text.insert(tk.END, f"Answer: {answer if match else 'No matching answer found'}\n")
 
     def __del__(self):
+        if hasattr(self, 'pipeline'):
+            self.pipeline.stop()
+        if hasattr(self, 'speech'):
+            self.speech.stop()
+        if getattr(self, 'recorder', None):
+            self.recorder.close()
         if hasattr(self, 'video_capture') and self.video_capture.isOpened():
             self.video_capture.release()
-        if hasattr(self, 'holistic'):
-            self.holistic.close()
-        # Clean up temp directory
-        if hasattr(self, 'temp_dir') and os.path.exists(self.temp_dir):
-            try:
-                os.rmdir(self.temp_dir)
-            except:
-                pass
+        if hasattr(self, 'landmarker'):
+            self.landmarker.close()
         # Quit mixer
         if mixer.get_init():
             mixer.quit()
@@ -0,0 +1,147 @@
+import io
+import math
+import shutil
+import struct
+import subprocess
+import threading
+import time
+import wave
+
+
+class TTSBackend:
+    """Turns text into encoded audio bytes held in memory.
+
+    Subclasses implement ``_synthesize``; ``synthesize`` wraps it to record
+    per-call latency, reported by ``stats()``. ``format`` is the audio
+    container of the returned bytes ("mp3" or "wav"), used as the playback
+    name hint and cache file extension.
+    """
+
+    name = None
+    format = None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = []
+
+    def synthesize(self, text, lang='en', tld='co.in'):
+        started = time.perf_counter()
+        audio = self._synthesize(text, lang, tld)
+        with self.lock:
+            self.durations.append((time.perf_counter() - started) * 1000)
+            del self.durations[:-1000]
+        return audio
+
+    def _synthesize(self, text, lang, tld):
+        raise NotImplementedError
+
+    def stats(self):
+        with self.lock:
+            durations = sorted(self.durations)
+        if not durations:
+            return {"backend": self.name, "calls": 0}
+        return {
+            "backend": self.name,
+            "calls": len(durations),
+            "mean_ms": sum(durations) / len(durations),
+            "p50_ms": durations[len(durations) // 2],
+            "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+        }
+
+
+class GTTSBackend(TTSBackend):
+    """Google Text-to-Speech; needs network access, returns MP3."""
+
+    name = "gtts"
+    format = "mp3"
+
+    def _synthesize(self, text, lang, tld):
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, tld=tld).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    """Offline synthesis with the espeak-ng (or espeak) command line tool, returns WAV.
+
+    ``tld`` has no espeak equivalent; ``voice`` overrides the voice derived from ``lang``.
+    """
+
+    name = "espeak"
+    format = "wav"
+
+    def __init__(self, executable=None, voice=None, words_per_minute=160):
+        super().__init__()
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.executable:
+            raise RuntimeError("espeak-ng is not installed")
+        self.voice = voice
+        self.words_per_minute = words_per_minute
+
+    def _synthesize(self, text, lang, tld):
+        completed = subprocess.run(
+            [self.executable, "--stdout", "-v", self.voice or lang, "-s", str(self.words_per_minute), text],
+            capture_output=True,
+            check=True,
+            timeout=30
+        )
+        return completed.stdout
+
+
+class ToneBackend(TTSBackend):
+    """Network- and dependency-free stand-in for tests and CI.
+
+    Produces a short sine tone (or silence with ``frequency=0``) whose length
+    grows with the text, so playback timing still resembles real speech.
+    """
+
+    name = "tone"
+    format = "wav"
+
+    def __init__(self, frequency=440, sample_rate=16000, seconds_per_char=0.02, max_seconds=3.0):
+        super().__init__()
+        self.frequency = frequency
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+        self.max_seconds = max_seconds
+
+    def _synthesize(self, text, lang, tld):
+        frames = int(self.sample_rate * min(self.max_seconds, 0.1 + len(text) * self.seconds_per_char))
+        step = 2 * math.pi * self.frequency / self.sample_rate
+        samples = struct.pack(f"<{frames}h", *(int(8000 * math.sin(step * i)) for i in range(frames)))
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(samples)
+        return buffer.getvalue()
+
+
+class SilentBackend(ToneBackend):
+    """ToneBackend that produces silence of the same length."""
+
+    name = "silent"
+
+    def __init__(self, **kwargs):
+        super().__init__(frequency=0, **kwargs)
+
+
+TTS_BACKENDS = {
+    "gtts": GTTSBackend,
+    "espeak": EspeakBackend,
+    "tone": ToneBackend,
+    "silent": SilentBackend,
+}
+
+
+def create_tts_backend(name="gtts"):
+    """Create a TTS backend by name; ``auto`` prefers espeak-ng when installed, else gTTS."""
+    if name == "auto":
+        name = "espeak" if shutil.which("espeak-ng") or shutil.which("espeak") else "gtts"
+    if name not in TTS_BACKENDS:
+        raise ValueError(f"Unknown TTS backend '{name}', expected one of {sorted(TTS_BACKENDS)} or 'auto'")
+    return TTS_BACKENDS[name]()
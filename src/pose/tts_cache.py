@@ -0,0 +1,152 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "natya_tts_cache")
+
+
+class TTSCache:
+    """Content-addressed cache of synthesized speech, in memory and on disk.
+
+    Audio is keyed by a hash of (text, lang, tld). Recently used clips stay
+    in an in-memory LRU of up to ``memory_items`` entries; every clip is also
+    written to a per-backend folder of ``cache_dir`` so it survives restarts,
+    and the least recently used files are deleted once the folder grows past
+    ``max_bytes``. Only a miss on both levels calls the TTS ``backend``.
+    """
+
+    def __init__(self, backend, cache_dir=DEFAULT_CACHE_DIR, max_bytes=50 * 1024 * 1024, memory_items=64,
+                 lang='en', tld='co.in'):
+        self.backend = backend
+        self.cache_dir = os.path.join(cache_dir, backend.name)
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.lang = lang
+        self.tld = tld
+        self.synthesize = backend.synthesize
+        self.extension = backend.format
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self.prewarm_thread = None
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Disk index in least-recently-used order, rebuilt from file mtimes
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(f".{self.extension}"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, name[:-len(self.extension) - 1], stat.st_size))
+        self.disk = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self.disk_bytes = sum(self.disk.values())
+
+    def key(self, text, lang=None, tld=None):
+        raw = f"{lang or self.lang}\0{tld or self.tld}\0{text}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.{self.extension}")
+
+    def get(self, text, lang=None, tld=None):
+        """Return the audio bytes for ``text``, synthesizing and caching them on a miss."""
+        key = self.key(text, lang, tld)
+        with self.lock:
+            audio = self.memory.get(key)
+            if audio is not None:
+                self.memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return audio
+            on_disk = key in self.disk
+
+        if on_disk:
+            try:
+                with open(self.path(key), "rb") as f:
+                    audio = f.read()
+                os.utime(self.path(key))
+                with self.lock:
+                    self.hits["disk"] += 1
+                    if key in self.disk:
+                        self.disk.move_to_end(key)
+                    self._remember(key, audio)
+                return audio
+            except OSError:
+                # Deleted behind our back; fall through and synthesize again
+                with self.lock:
+                    self.disk_bytes -= self.disk.pop(key, 0)
+
+        audio = self.synthesize(text, lang or self.lang, tld or self.tld)
+        self._store(key, audio)
+        with self.lock:
+            self.misses += 1
+            self._remember(key, audio)
+        return audio
+
+    def contains(self, text, lang=None, tld=None):
+        key = self.key(text, lang, tld)
+        with self.lock:
+            return key in self.memory or key in self.disk
+
+    def _remember(self, key, audio):
+        self.memory[key] = audio
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    def _store(self, key, audio):
+        # Write under a temporary name so a crash never leaves a truncated clip
+        temp_path = f"{self.path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(audio)
+            os.replace(temp_path, self.path(key))
+        except OSError as e:
+            print(f"TTS cache write error: {e}")
+            return
+
+        with self.lock:
+            self.disk_bytes += len(audio) - self.disk.pop(key, 0)
+            self.disk[key] = len(audio)
+            while self.disk_bytes > self.max_bytes and len(self.disk) > 1:
+                old_key, size = self.disk.popitem(last=False)
+                self.disk_bytes -= size
+                try:
+                    os.remove(self.path(old_key))
+                except OSError:
+                    pass
+
+    def prewarm(self, phrases, lang=None, tld=None):
+        """Synthesize every phrase not cached yet on a background thread."""
+        phrases = list(dict.fromkeys(phrases))
+
+        def prewarm_thread():
+            for text in phrases:
+                if self.contains(text, lang, tld):
+                    continue
+                try:
+                    audio = self.synthesize(text, lang or self.lang, tld or self.tld)
+                    self._store(self.key(text, lang, tld), audio)
+                except Exception as e:
+                    print(f"TTS prewarm error: {e}")
+                    return
+
+        self.prewarm_thread = threading.Thread(target=prewarm_thread, name="tts-prewarm", daemon=True)
+        self.prewarm_thread.start()
+        return self.prewarm_thread
+
+    def stats(self):
+        with self.lock:
+            hits = self.hits["memory"] + self.hits["disk"]
+            total = hits + self.misses
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "hit_ratio": hits / total if total else 0.0,
+                "memory_items": len(self.memory),
+                "disk_items": len(self.disk),
+                "disk_bytes": self.disk_bytes,
+                "synthesis": self.backend.stats(),
+            }
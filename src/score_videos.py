@@ -0,0 +1,292 @@
+"""Score recorded practice videos offline with the mudra model and the pose-angle scorer.
+
+Each video is decoded in a background thread, frames are run through the
+mudra YOLO model in batches and through MediaPipe Pose for the joint angles,
+and per-frame results are written to a compact columnar file in the output
+directory (``<video path>.npz``, or ``.parquet`` with pyarrow, named after the
+video's path relative to the common directory of all inputs).
+Frames are mirrored once, like the live pose app's selfie view, so both
+models see the same image and left/right match the reference angles.
+Several videos are scored in parallel with a process pool; a video that
+fails is reported and the others are still written.
+
+Usage:
+    python src/score_videos.py public/1.mp4 public/2.mp4 public/3.mp4 \
+        --pose Araimandi --stride 2 --batch-size 16 --jobs 3 --out scores/
+"""
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(SRC_DIR, "mudra"), os.path.join(SRC_DIR, "pose")]
+
+from backends import BACKENDS, load_model  # noqa: E402
+from model_registry import DEFAULT_WEIGHTS  # noqa: E402
+from pose_angles import ANGLE_NAMES, REFERENCE_ANGLES, angle_accuracy_array, compute_angle_array, landmarks_to_array  # noqa: E402
+from pose_engine import PoseScoringEngine  # noqa: E402
+
+# Per-process state, created once by the pool initializer
+worker_state = {}
+
+
+def decode_frames(path, stride, batch_size, mirror, output, stop, errors):
+    """Read every ``stride``-th frame of a video and put batches on ``output``.
+
+    Skipped frames are only grabbed, not decoded. ``None`` marks the end; a
+    video that cannot be opened is reported through ``errors``.
+    """
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    batch = []
+    index = 0
+    try:
+        if not cap.isOpened():
+            errors.append(f"cannot open video {path}")
+            return
+        while not stop.is_set():
+            if index % stride:
+                if not cap.grab():
+                    break
+            else:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if mirror:
+                    frame = cv2.flip(frame, 1)
+                batch.append((index, index / fps, frame))
+                if len(batch) == batch_size:
+                    output.put(batch)
+                    batch = []
+            index += 1
+        if batch:
+            output.put(batch)
+    finally:
+        cap.release()
+        output.put(None)
+
+
+def init_worker(weights, backend, imgsz, model_complexity):
+    import mediapipe as mp
+
+    worker_state["model"] = load_model(weights, backend, imgsz=imgsz)
+    worker_state["engine"] = PoseScoringEngine()
+    # Pose runs in tracking mode, so each video gets a fresh instance (see score_video)
+    worker_state["new_pose"] = lambda: mp.solutions.pose.Pose(
+        static_image_mode=False,
+        model_complexity=model_complexity,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+def score_video(path, name, out_dir, pose_name, stride, batch_size, mirror, output_format):
+    """Score one video; returns ``(path, out_path, frames, seconds, error)``.
+
+    Failures are caught here so one unreadable video does not discard the
+    results of the others.
+    """
+    started = time.perf_counter()
+    try:
+        return _score_video(path, name, out_dir, pose_name, stride, batch_size, mirror, output_format) + (None,)
+    except Exception as e:
+        return path, None, 0, time.perf_counter() - started, f"{type(e).__name__}: {str(e)}"
+
+
+def _score_video(path, name, out_dir, pose_name, stride, batch_size, mirror, output_format):
+    model = worker_state["model"]
+    # Landmarks tracked at the end of the previous video must not seed this one
+    pose = worker_state["new_pose"]()
+    engine = worker_state["engine"]
+    reference = engine.reference_angles.get(pose_name) if pose_name else None
+
+    frame_index, timestamps = [], []
+    mudra_class, mudra_confidence, mudra_count = [], [], []
+    angle_batches = []
+    class_names = None
+
+    batches = queue.Queue(maxsize=4)
+    stop = threading.Event()
+    errors = []
+    decoder = threading.Thread(
+        target=decode_frames, args=(path, stride, batch_size, mirror, batches, stop, errors), daemon=True
+    )
+    started = time.perf_counter()
+    decoder.start()
+
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+
+            images = [frame for _, _, frame in batch]
+            results = model(images, verbose=False)
+            class_names = class_names or results[0].names
+
+            # Landmarks for the whole batch, NaN where no pose was found
+            points = np.full((len(batch), 33, 2), np.nan)
+            for i, ((index, timestamp, frame), result) in enumerate(zip(batch, results)):
+                frame_index.append(index)
+                timestamps.append(timestamp)
+
+                boxes = result.boxes
+                if boxes is not None and len(boxes):
+                    best = int(boxes.conf.argmax())
+                    mudra_class.append(int(boxes.cls[best]))
+                    mudra_confidence.append(float(boxes.conf[best]))
+                    mudra_count.append(len(boxes))
+                else:
+                    mudra_class.append(-1)
+                    mudra_confidence.append(0.0)
+                    mudra_count.append(0)
+
+                pose_results = pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                if pose_results.pose_landmarks:
+                    points[i] = landmarks_to_array(pose_results.pose_landmarks.landmark)
+
+            # One vectorized pass computes all seven angles for every frame in the batch
+            angle_batches.append(compute_angle_array(points))
+    finally:
+        pose.close()
+        stop.set()
+        # Unblock the decoder if it is waiting on a full queue
+        while decoder.is_alive():
+            try:
+                batches.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    if errors:
+        raise IOError(errors[0])
+    angles = np.concatenate(angle_batches) if angle_batches else np.empty((0, len(ANGLE_NAMES)))
+    if reference:
+        accuracy = angle_accuracy_array(angles, reference, engine.tolerances).mean(axis=1)
+    else:
+        accuracy = np.full(len(angles), np.nan)
+
+    elapsed = time.perf_counter() - started
+    columns = {
+        "frame_index": np.asarray(frame_index, dtype=np.int32),
+        "timestamp": np.asarray(timestamps, dtype=np.float32),
+        "mudra_class": np.asarray(mudra_class, dtype=np.int16),
+        "mudra_confidence": np.asarray(mudra_confidence, dtype=np.float32),
+        "mudra_count": np.asarray(mudra_count, dtype=np.int16),
+        "angles": angles.astype(np.float32),
+        "pose_accuracy": accuracy.astype(np.float32),
+    }
+    names = [class_names[i] for i in sorted(class_names)] if class_names else []
+    out_path = write_results(name, out_dir, columns, names, pose_name, output_format)
+    return path, out_path, len(frame_index), elapsed
+
+
+def output_names(videos):
+    """Output file name per video, unique even for equal basenames in different directories.
+
+    Names are the path relative to the videos' common directory with
+    separators replaced by ``__``; any remaining clash gets a ``-2``, ``-3``
+    ... suffix.
+    """
+    paths = [os.path.abspath(video) for video in videos]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths])
+    names, taken = [], set()
+    for path in paths:
+        name = os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, "__")
+        unique, suffix = name, 1
+        while unique in taken:
+            suffix += 1
+            unique = f"{name}-{suffix}"
+        taken.add(unique)
+        names.append(unique)
+    return names
+
+
+def write_results(name, out_dir, columns, class_names, pose_name, output_format):
+    base = os.path.join(out_dir, name)
+
+    if output_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({
+            **{name: columns[name] for name in columns if name != "angles"},
+            **{f"angle_{name}": columns["angles"][:, i] for i, name in enumerate(ANGLE_NAMES)},
+        })
+        table = table.replace_schema_metadata({
+            "class_names": ",".join(class_names),
+            "pose": pose_name or "",
+        })
+        out_path = base + ".parquet"
+        pq.write_table(table, out_path, compression="zstd")
+    else:
+        out_path = base + ".npz"
+        np.savez_compressed(
+            out_path,
+            **columns,
+            angle_names=np.asarray(ANGLE_NAMES),
+            class_names=np.asarray(class_names),
+            pose=np.asarray(pose_name or ""),
+        )
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--out", default="scores")
+    parser.add_argument("--format", choices=["npz", "parquet"], default="npz")
+    parser.add_argument("--pose", choices=sorted(REFERENCE_ANGLES), help="Reference pose for accuracy scoring")
+    parser.add_argument("--stride", type=int, default=1, help="Score every Nth frame")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--jobs", type=int, default=min(os.cpu_count() or 1, 4), help="Videos scored in parallel")
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS)
+    parser.add_argument("--backend", default="torch", choices=BACKENDS)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--pose-complexity", type=int, choices=[0, 1, 2], default=1)
+    parser.add_argument("--no-mirror", action="store_true", help="Score frames as recorded instead of mirrored")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    jobs = max(1, min(args.jobs, len(args.videos)))
+    started = time.perf_counter()
+    total_frames = 0
+    failed = []
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker,
+        initargs=(args.weights, args.backend, args.imgsz, args.pose_complexity)
+    ) as pool:
+        futures = [
+            pool.submit(
+                score_video, video, name, args.out, args.pose, max(args.stride, 1), args.batch_size,
+                not args.no_mirror, args.format
+            )
+            for video, name in zip(args.videos, output_names(args.videos))
+        ]
+        for future in as_completed(futures):
+            path, out_path, frames, elapsed, error = future.result()
+            if error:
+                failed.append(path)
+                print(f"{path}: failed ({error})")
+                continue
+            total_frames += frames
+            print(f"{path}: {frames} frames in {elapsed:.1f}s ({frames / elapsed:.1f} frames/s) -> {out_path}")
+
+    elapsed = time.perf_counter() - started
+    print(f"Scored {total_frames} frames from {len(args.videos) - len(failed)} videos in {elapsed:.1f}s "
+          f"({total_frames / elapsed:.1f} frames/s with {jobs} processes)")
+    if failed:
+        print(f"{len(failed)} of {len(args.videos)} videos failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()